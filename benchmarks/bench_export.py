@@ -0,0 +1,83 @@
+"""Benchmark the streaming exporters against fetchall.
+
+    python benchmarks/bench_export.py --sizes 10000 100000 1000000 --output export.json
+
+For each size and format this records rows/sec, output bytes and the peak
+Python memory traced during the export. The streaming peak should stay flat
+as the table grows; the fetchall baseline (load_students) grows with it.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from common import ROOT, run_metadata
+from load_test import seed_database
+
+FORMATS = ("csv", "jsonl", "columnar")
+EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "columnar": ".cols"}
+
+
+def traced(fn, *args):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = fn(*args)
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak // 1024
+
+
+def bench_size(school_db, size, directory, chunk_size):
+    db_path = os.path.join(directory, f"export_{size}.db")
+    seed_database(db_path, size)
+    school_db.configure_db(db_path)
+    results = []
+    rows, seconds, peak_kb = traced(school_db.load_students.uncached)
+    results.append({"size": size, "kind": "students", "format": "fetchall", "rows": len(rows),
+                    "rows_per_sec": len(rows) / seconds, "traced_peak_kb": peak_kb})
+    del rows
+    for kind in ("students", "feedback", "grades"):
+        for fmt in FORMATS:
+            path = os.path.join(directory, f"{kind}_{size}{EXTENSIONS[fmt]}")
+            result, _, peak_kb = traced(school_db.export_table, kind, path, fmt, chunk_size)
+            results.append({"size": size, "kind": kind, "format": fmt, "rows": result.rows,
+                            "rows_per_sec": result.rows_per_sec(), "bytes": result.bytes,
+                            "traced_peak_kb": peak_kb})
+            os.remove(path)
+    school_db.close_db()
+    for r in results:
+        print(f"n={size:<8} {r['kind']:<9} {r['format']:<9} {r['rows_per_sec']:>10.0f} rows/s  "
+              f"peak={r['traced_peak_kb']}KiB", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    import school_db
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            results.extend(bench_size(school_db, size, directory, args.chunk_size))
+
+    report = {"meta": run_metadata(), "sizes": args.sizes, "chunk_size": args.chunk_size, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
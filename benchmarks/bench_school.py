@@ -0,0 +1,130 @@
+"""Benchmark the core model and the SQLite data path on synthetic schools.
+
+    python benchmarks/bench_school.py --sizes 10000 100000 --output bench.json
+
+Each size is a number of people (students plus teachers). Results are
+written as JSON so runs can be compared over time.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+
+from common import Recorder, load_module, run_metadata
+
+SUBJECTS = ("Math", "English", "Science", "History", "Art", "Physics")
+CLASSES = tuple(f"{level}-{section}" for level in range(1, 13) for section in "ABCD")
+STUDENTS_PER_TEACHER = 20
+
+
+def synthetic_people(size, seed=42):
+    """Deterministic (students, teachers) rows with grades for `size` people."""
+    rng = random.Random(seed)
+    teachers = size // (STUDENTS_PER_TEACHER + 1) or 1
+    students = size - teachers
+    student_rows = []
+    for i in range(students):
+        student_class = rng.choice(CLASSES)
+        grades = {subject: rng.randint(30, 100) for subject in rng.sample(SUBJECTS, rng.randint(0, 5))}
+        student_rows.append((f"S{i:07d}", f"Student {i}", rng.randint(6, 18), f"01{rng.randrange(10**9):09d}",
+                             int(student_class.split("-")[0]), student_class, grades))
+    teacher_rows = [(f"T{i:06d}", f"Teacher {i}", rng.randint(25, 65), f"01{rng.randrange(10**9):09d}",
+                     rng.choice(SUBJECTS), float(rng.randrange(3000, 9000, 50)))
+                    for i in range(teachers)]
+    return student_rows, teacher_rows
+
+
+def bench_core(recorder, size, student_rows, teacher_rows):
+    system = load_module("school_system", "school system.py")
+    school = system.School("Benchmark School")
+    students = []
+    for *fields, grades in student_rows:
+        student = system.Student(*fields)
+        for subject, grade in grades.items():
+            student.add_grade(subject, grade)
+        students.append(student)
+    teachers = [system.Teacher(*row) for row in teacher_rows]
+    ids = [student.get_id() for student in students]
+
+    recorder.run("core.add_student", size, ((school.add_student, (s,)) for s in students))
+    for teacher in teachers:
+        school.add_teacher(teacher)
+    recorder.run("core.calculate_student_gpa", size,
+                 ((school.calculate_student_gpa, (i,)) for i in ids))
+    recorder.run("core.generate_report", size, ((school.generate_report, (i,)) for i in ids))
+    recorder.run("core.get_statistics", size, ((school.get_statistics, ()) for _ in range(1000)))
+
+    def tax_loop():
+        return [system.Teacher.calculate_tax(teacher.get_salary()) for teacher in teachers]
+    recorder.run("core.calculate_tax_loop", size, ((tax_loop, ()) for _ in range(10)))
+    recorder.run("core.run_payroll", size, ((school.run_payroll, ()) for _ in range(10)))
+
+
+def bench_db(recorder, size, student_rows, teacher_rows, directory):
+    db = load_module("school_db", "school_db.py")  # the data layer behind "school project.py"
+    db.configure_db(os.path.join(directory, f"bench_{size}.db"))
+    students = [db.Student(*fields) for *fields, _ in student_rows]
+    teachers = [db.Teacher(*row) for row in teacher_rows]
+
+    recorder.run("db.init_db", size, [(db.init_db, ())])
+    recorder.run("db.add_student_to_db", size, ((db.add_student_to_db, (s,)) for s in students))
+    recorder.run("db.add_teacher_to_db", size, ((db.add_teacher_to_db, (t,)) for t in teachers))
+    recorder.run("db.add_grade_to_db", size,
+                 ((db.add_grade_to_db, (row[0], subject, grade))
+                  for row in student_rows[:10000] for subject, grade in row[-1].items()))
+    recorder.run("db.add_feedback", size,
+                 ((db.add_feedback, (s.id, "Student", f"Comment from {s.name}"))
+                  for s in students[:10000]))
+    recorder.run("db.load_students", size, [(db.load_students, ())])
+    recorder.run("db.load_teachers", size, [(db.load_teachers, ())])
+    recorder.run("db.load_feedback", size, [(db.load_feedback, ())])
+
+    def walk_pages(fetch, pages=50):
+        last = None
+        for _ in range(pages):
+            rows = fetch(last)
+            if not rows:
+                return
+            last = rows[-1][0]
+    recorder.run("gui.students_page_walk", size,
+                 [(walk_pages, (db.load_student_averages_page,))])
+    def payroll_uncached():
+        db.query_cache.clear()
+        return db.payroll()
+    recorder.run("db.payroll", size, ((payroll_uncached, ()) for _ in range(10)))
+    db.close_db()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000],
+                        help="people per synthetic school (e.g. 10000 100000 1000000)")
+    parser.add_argument("--only", choices=("core", "db"), help="run one half of the suite")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also record tracemalloc peaks (slows every case down)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    recorder = Recorder(trace_memory=args.trace_memory)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            student_rows, teacher_rows = synthetic_people(size)
+            if args.only != "db":
+                bench_core(recorder, size, student_rows, teacher_rows)
+            if args.only != "core":
+                bench_db(recorder, size, student_rows, teacher_rows, directory)
+
+    report = {"meta": run_metadata(), "sizes": args.sizes, "results": recorder.results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Compare School startup from a binary snapshot, pickle and SQLite.
+
+    python benchmarks/bench_snapshot.py --sizes 10000 100000 --output snapshot.json
+
+For each size this records the file size, the time to write it, the time
+until the first lookup by ID can be answered, and the time to a fully
+materialized school.
+"""
+
+import argparse
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+from bench_school import synthetic_people
+from common import load_module, peak_rss_kb, run_metadata
+
+
+def build_school(system, student_rows, teacher_rows):
+    school = system.School("Benchmark School")
+    for *fields, grades in student_rows:
+        student = system.Student(*fields)
+        for subject, grade in grades.items():
+            student.add_grade(subject, grade)
+        school.add_student(student)
+    for row in teacher_rows:
+        school.add_teacher(system.Teacher(*row))
+    return school
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+def bench_size(system, size, directory):
+    student_rows, teacher_rows = synthetic_people(size)
+    school, build_seconds = timed(build_school, system, student_rows, teacher_rows)
+    probe_id = student_rows[len(student_rows) // 2][0]
+    results = {"size": size, "rebuild_objects_seconds": build_seconds}
+
+    # Binary snapshot
+    path = os.path.join(directory, f"school_{size}.snap")
+    _, results["snapshot_write_seconds"] = timed(school.save_snapshot, path)
+    results["snapshot_bytes"] = os.path.getsize(path)
+    started = time.perf_counter()
+    loaded = system.School.load_snapshot(path)
+    loaded.get_student(probe_id)
+    results["snapshot_first_lookup_seconds"] = time.perf_counter() - started
+    _, results["snapshot_full_load_seconds"] = timed(loaded.get_all_students)
+
+    # Pickle
+    path = os.path.join(directory, f"school_{size}.pickle")
+    with open(path, "wb") as f:
+        _, results["pickle_write_seconds"] = timed(pickle.dump, school, f, pickle.HIGHEST_PROTOCOL)
+    results["pickle_bytes"] = os.path.getsize(path)
+    with open(path, "rb") as f:
+        unpickled, results["pickle_load_seconds"] = timed(pickle.load, f)
+    unpickled.get_student(probe_id)
+
+    # SQLite through SchoolRepository
+    path = os.path.join(directory, f"school_{size}.db")
+    repository = system.SchoolRepository(path, flush_threshold=len(student_rows) * 8 + 1000, max_delay=3600)
+    persisted = system.School("Benchmark School", repository=repository)
+    for student in school.get_all_students():
+        persisted.add_student(student)
+    for teacher in school.get_all_teachers():
+        persisted.add_teacher(teacher)
+    _, results["sqlite_write_seconds"] = timed(persisted.save)
+    repository.close()
+    results["sqlite_bytes"] = os.path.getsize(path)
+
+    def rebuild_from_sqlite():
+        repo = system.SchoolRepository(path)
+        rebuilt = system.School("Benchmark School", repository=repo)
+        rebuilt.get_student(probe_id)
+        repo.close()
+    _, results["sqlite_load_seconds"] = timed(rebuild_from_sqlite)
+    results["peak_rss_kb"] = peak_rss_kb()
+    print(f"n={size:<8} snapshot first lookup {results['snapshot_first_lookup_seconds'] * 1000:.2f}ms, "
+          f"full {results['snapshot_full_load_seconds']:.2f}s | pickle {results['pickle_load_seconds']:.2f}s | "
+          f"sqlite {results['sqlite_load_seconds']:.2f}s", file=sys.stderr)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000])
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    system = load_module("school_system", "school system.py")
+    with tempfile.TemporaryDirectory() as directory:
+        results = [bench_size(system, size, directory) for size in args.sizes]
+
+    report = {"meta": run_metadata(), "sizes": args.sizes, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
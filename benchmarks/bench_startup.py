@@ -0,0 +1,93 @@
+"""Measure import and startup time of the data layer, the headless CLI and the GUI toolkit.
+
+    python benchmarks/bench_startup.py --repeat 20 --output startup.json
+
+Every case runs in a fresh interpreter, so the numbers include interpreter
+start-up; the "python -c pass" case is the baseline to subtract.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from common import ROOT, percentile, run_metadata
+
+PROJECT = os.path.join(ROOT, "school project.py")
+
+
+def cases(db_path):
+    import_path = f"import sys; sys.path.insert(0, {ROOT!r}); "
+    return [
+        ("python", [sys.executable, "-c", "pass"]),
+        ("import tkinter", [sys.executable, "-c", "import tkinter, tkinter.ttk, tkinter.messagebox"]),
+        ("import school_db", [sys.executable, "-c", import_path + "import school_db"]),
+        ("cli list students", [sys.executable, PROJECT, "--db", db_path, "list", "students", "--limit", "1"]),
+        ("cli query student", [sys.executable, PROJECT, "--db", db_path, "query", "student", "S1"]),
+    ]
+
+
+def time_command(command, repeat):
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        seconds.append(time.perf_counter() - started)
+    ordered = sorted(seconds)
+    return {
+        "runs": repeat,
+        "min_ms": ordered[0] * 1000,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p90_ms": percentile(ordered, 0.90) * 1000,
+    }
+
+
+def tkinter_loaded(db_path):
+    """True if the headless CLI imported tkinter anyway"""
+    probe = (f"import runpy, sys; sys.argv = [{PROJECT!r}, '--db', {db_path!r}, 'list', 'students'];\n"
+             "try:\n    runpy.run_path(sys.argv[0], run_name='__main__')\n"
+             "except SystemExit:\n    pass\n"
+             "print('tkinter' in sys.modules)")
+    output = subprocess.run([sys.executable, "-c", probe], check=True, capture_output=True, text=True,
+                            cwd=ROOT).stdout
+    return output.strip().splitlines()[-1] == "True"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "startup.db")
+        subprocess.run([sys.executable, PROJECT, "--db", db_path, "add", "student",
+                        "S1", "Startup Probe", "15", "0123456789", "10", "10-A"],
+                       check=True, stdout=subprocess.DEVNULL)
+        for name, command in cases(db_path):
+            try:
+                result = time_command(command, args.repeat)
+            except subprocess.CalledProcessError:
+                print(f"{name:<20} failed (not available here)", file=sys.stderr)
+                continue
+            result["name"] = name
+            results.append(result)
+            print(f"{name:<20} p50={result['p50_ms']:.1f}ms min={result['min_ms']:.1f}ms", file=sys.stderr)
+        headless_without_tk = not tkinter_loaded(db_path)
+
+    report = {"meta": run_metadata(), "repeat": args.repeat, "results": results,
+              "headless_without_tkinter": headless_without_tk}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
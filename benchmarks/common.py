@@ -0,0 +1,97 @@
+"""Shared helpers for the benchmark scripts."""
+
+import importlib.util
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_module(name, filename):
+    """Import one of the project scripts (their file names contain spaces)."""
+    if name in sys.modules:
+        return sys.modules[name]
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)  # for shared modules such as metrics.py
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+class Recorder:
+    """Times each call of a benchmark case and collects one result dict per case."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.results = []
+
+    def run(self, name, size, calls):
+        """Time fn(*args) for every (fn, args) pair in calls."""
+        if self.trace_memory:
+            tracemalloc.start()
+        latencies = []
+        started = time.perf_counter()
+        for fn, args in calls:
+            t0 = time.perf_counter_ns()
+            fn(*args)
+            latencies.append(time.perf_counter_ns() - t0)
+        seconds = time.perf_counter() - started
+        result = summarize(name, size, latencies, seconds)
+        if self.trace_memory:
+            result["traced_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+            tracemalloc.stop()
+        result["peak_rss_kb"] = peak_rss_kb()
+        self.results.append(result)
+        print(f"{name:<32} n={size:<8} {result['ops_per_sec']:>12.0f} ops/s  "
+              f"p50={result['p50_us']:.1f}us p99={result['p99_us']:.1f}us", file=sys.stderr)
+        return result
+
+
+def summarize(name, size, latencies_ns, seconds):
+    ordered = sorted(latencies_ns)
+    ops = len(ordered)
+    return {
+        "name": name,
+        "size": size,
+        "ops": ops,
+        "seconds": round(seconds, 6),
+        "ops_per_sec": ops / seconds if seconds else 0.0,
+        "p50_us": percentile(ordered, 0.50) / 1000,
+        "p90_us": percentile(ordered, 0.90) / 1000,
+        "p99_us": percentile(ordered, 0.99) / 1000,
+        "max_us": (ordered[-1] if ordered else 0) / 1000,
+    }
+
+
+def run_metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": commit,
+    }
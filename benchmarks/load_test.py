@@ -0,0 +1,207 @@
+"""Load-test the JSON HTTP API (school_api.py) on localhost.
+
+    python benchmarks/load_test.py --size 20000 --clients 8 --duration 10 --output load.json
+    python benchmarks/load_test.py --url http://127.0.0.1:8765 --clients 8
+
+Without --url it seeds a temporary database with synthetic people, starts
+the API in a separate process and tests that. Each client thread keeps
+one keep-alive connection and sends a mix of list, lookup, search, School
+and (with --write-ratio) write requests until the duration is up. The
+report has requests/sec plus p50/p99 latency overall and per endpoint.
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from bench_school import synthetic_people
+from common import ROOT, percentile, run_metadata
+
+SUBJECTS = ("Math", "English", "Science", "History", "Art")
+WORDS = ("late", "homework", "library", "cafeteria", "exam", "bus", "sports", "projector")
+
+
+def seed_database(path, size):
+    """Fill a fresh database through school_db; returns (student ids, teacher ids, class names)"""
+    sys.path.insert(0, ROOT)
+    import school_db
+    school_db.configure_db(path)
+    school_db.init_db()
+    student_rows, teacher_rows = synthetic_people(size)
+    school_db.bulk_import("students", ((i, dict(zip(school_db.STUDENT_FIELDS, map(str, fields))))
+                                       for i, (*fields, _) in enumerate(student_rows)))
+    school_db.bulk_import("teachers", ((i, dict(zip(school_db.TEACHER_FIELDS, map(str, row))))
+                                       for i, row in enumerate(teacher_rows)))
+    with school_db.write_transaction() as conn:
+        conn.executemany(school_db.UPSERT_GRADE, ((row[0], subject, grade) for *row, grades in student_rows
+                                                  for subject, grade in grades.items()))
+        rng = random.Random(7)
+        conn.executemany(school_db.INSERT_FEEDBACK, ((row[0], "Student", " ".join(rng.choices(WORDS, k=6)))
+                                                     for row in student_rows[:5000]))
+    school_db.close_db()
+    return ([row[0] for row in student_rows], [row[0] for row in teacher_rows],
+            sorted({row[5] for row in student_rows}))
+
+
+def start_server(db_path, workers):
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "school_api.py"), "--db", db_path,
+                                "--port", "0", "--workers", str(workers)],
+                               stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()  # "Serving on http://host:port"
+    if not line.startswith("Serving on "):
+        process.kill()
+        raise RuntimeError("API server did not start")
+    return process, line.split()[-1]
+
+
+def request_mix(rng, student_ids, teacher_ids, classes, write_ratio):
+    """(endpoint name, method, path, body) for one random request"""
+    if rng.random() < write_ratio:
+        body = {"student_id": rng.choice(student_ids), "subject": rng.choice(SUBJECTS),
+                "grade": rng.randint(0, 100)}
+        return "POST /grades", "POST", "/grades", body
+    roll = rng.random()
+    if roll < 0.25:
+        return "GET /students/{id}", "GET", f"/students/{rng.choice(student_ids)}", None
+    if roll < 0.40:
+        after = rng.choice(student_ids)
+        return "GET /averages", "GET", f"/averages?after={after}&limit=50", None
+    if roll < 0.50:
+        return "GET /teachers/{id}", "GET", f"/teachers/{rng.choice(teacher_ids)}", None
+    if roll < 0.65:
+        return "GET /feedback/search", "GET", f"/feedback/search?q={rng.choice(WORDS)[:4]}&limit=20", None
+    if roll < 0.80:
+        return "GET /school/top", "GET", f"/school/top?n=10&class={rng.choice(classes)}", None
+    if roll < 0.90:
+        return "GET /school/rank/{id}", "GET", f"/school/rank/{rng.choice(student_ids)}", None
+    return "GET /school/gpa/{id}", "GET", f"/school/gpa/{rng.choice(student_ids)}", None
+
+
+def client(url, deadline, seed, people, write_ratio, samples, errors):
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+    rng = random.Random(seed)
+    local = []
+    while time.perf_counter() < deadline:
+        name, method, path, body = request_mix(rng, *people, write_ratio)
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload else {}
+        started = time.perf_counter_ns()
+        try:
+            conn.request(method, path, body=payload, headers=headers)
+            response = conn.getresponse()
+            response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            conn.close()
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+            status = None
+        local.append((name, time.perf_counter_ns() - started))
+        if status is None or status >= 500:
+            errors.append((name, status))
+    conn.close()
+    samples.extend(local)
+
+
+def summarize(latencies_ns, seconds):
+    ordered = sorted(latencies_ns)
+    return {
+        "requests": len(ordered),
+        "requests_per_sec": len(ordered) / seconds if seconds else 0.0,
+        "p50_ms": percentile(ordered, 0.50) / 1e6,
+        "p99_ms": percentile(ordered, 0.99) / 1e6,
+        "max_ms": (ordered[-1] if ordered else 0) / 1e6,
+    }
+
+
+def discover_people(url):
+    """Student and teacher ids and class names from a running server (first pages only)"""
+    parts = urlsplit(url)
+    conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+
+    def get(path):
+        conn.request("GET", path)
+        return json.loads(conn.getresponse().read())["items"]
+
+    students = get("/students?limit=1000")
+    teachers = get("/teachers?limit=1000")
+    conn.close()
+    if not students or not teachers:
+        raise SystemExit("the server needs at least one student and one teacher")
+    return ([s["id"] for s in students], [t["id"] for t in teachers],
+            sorted({s["student_class"] for s in students}))
+
+
+def run_load(url, people, clients, duration, write_ratio):
+    # Warm-up: the first School request builds the in-memory model
+    client(url, time.perf_counter() + min(1.0, duration), 0, people, 0.0, [], [])
+    samples, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(url, deadline, seed, people, write_ratio, samples, errors))
+               for seed in range(1, clients + 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - started
+    by_endpoint = {}
+    for name, latency in samples:
+        by_endpoint.setdefault(name, []).append(latency)
+    report = summarize([latency for _, latency in samples], seconds)
+    report["errors"] = len(errors)
+    report["endpoints"] = {name: summarize(latencies, seconds) for name, latencies in sorted(by_endpoint.items())}
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="test a running server; student ids are read from it")
+    parser.add_argument("--size", type=int, default=20000, help="people to seed when starting a server")
+    parser.add_argument("--workers", type=int, default=16, help="server threads when starting a server")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="fraction of requests that POST a grade")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    process = None
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            if args.url:
+                url = args.url.rstrip("/")
+                people = discover_people(url)
+            else:
+                people = seed_database(os.path.join(directory, "load.db"), args.size)
+                process, url = start_server(os.path.join(directory, "load.db"), args.workers)
+            report = run_load(url, people, args.clients, args.duration, args.write_ratio)
+        finally:
+            if process is not None:
+                process.terminate()
+                process.wait()
+
+    print(f"{report['requests']} requests in {args.duration:g}s: {report['requests_per_sec']:.0f} req/s, "
+          f"p50={report['p50_ms']:.2f}ms p99={report['p99_ms']:.2f}ms, {report['errors']} errors", file=sys.stderr)
+    for name, stats in report["endpoints"].items():
+        print(f"  {name:<24} {stats['requests_per_sec']:>8.0f} req/s  p50={stats['p50_ms']:.2f}ms "
+              f"p99={stats['p99_ms']:.2f}ms", file=sys.stderr)
+    result = {"meta": run_metadata(), "url": None if process else url, "size": None if args.url else args.size,
+              "clients": args.clients, "duration": args.duration, "write_ratio": args.write_ratio, **report}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        json.dump(result, sys.stdout, indent=2)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+# METRICS
+# Per-operation call counts, latency histograms and row counts shared by
+# "school system.py" and "school project.py".
+#
+# Disabled by default; a disabled instrumented call costs one flag check.
+# Set SCHOOL_METRICS=path.json (or path.prom) to record a run and dump it at exit.
+
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+
+# Histogram bucket upper bounds, in seconds
+BUCKETS = (0.00001, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_enabled = False
+
+
+class OperationStats:
+    """Running totals for one named operation"""
+
+    __slots__ = ("calls", "errors", "rows", "seconds", "max_seconds", "buckets")
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.rows = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+
+    def to_dict(self):
+        # Cumulative counts keyed by upper bound, as Prometheus expects
+        cumulative = {}
+        total = 0
+        for bound, count in zip(BUCKETS + ("+Inf",), self.buckets):
+            total += count
+            cumulative[str(bound)] = total
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rows": self.rows,
+            "seconds": self.seconds,
+            "mean_ms": self.seconds / self.calls * 1000 if self.calls else 0.0,
+            "max_ms": self.max_seconds * 1000,
+            "buckets": cumulative,
+        }
+
+
+class Registry:
+    """Thread-safe collection of OperationStats keyed by operation name"""
+
+    def __init__(self):
+        self._operations = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds, rows=0, error=False):
+        with self._lock:
+            stats = self._operations.get(name)
+            if stats is None:
+                stats = self._operations[name] = OperationStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.rows += rows
+            stats.seconds += seconds
+            if seconds > stats.max_seconds:
+                stats.max_seconds = seconds
+            stats.buckets[bisect_left(BUCKETS, seconds)] += 1
+
+    def reset(self):
+        with self._lock:
+            self._operations.clear()
+
+    def snapshot(self):
+        """{operation: stats dict}, sorted by operation name"""
+        with self._lock:
+            return {name: self._operations[name].to_dict() for name in sorted(self._operations)}
+
+    def to_json(self):
+        return json.dumps({"timestamp": time.time(), "operations": self.snapshot()}, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format"""
+        operations = self.snapshot()
+        lines = []
+        for metric, key, kind, help_text in (
+                ("school_operation_calls_total", "calls", "counter", "Calls per operation"),
+                ("school_operation_errors_total", "errors", "counter", "Calls that raised"),
+                ("school_operation_rows_total", "rows", "counter", "Rows read or written")):
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, stats in operations.items():
+                lines.append(f'{metric}{{operation="{name}"}} {stats[key]}')
+        metric = "school_operation_duration_seconds"
+        lines.append(f"# HELP {metric} Latency per operation")
+        lines.append(f"# TYPE {metric} histogram")
+        for name, stats in operations.items():
+            for bound, count in stats["buckets"].items():
+                lines.append(f'{metric}_bucket{{operation="{name}",le="{bound}"}} {count}')
+            lines.append(f'{metric}_sum{{operation="{name}"}} {stats["seconds"]}')
+            lines.append(f'{metric}_count{{operation="{name}"}} {stats["calls"]}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        """Write metrics to path: Prometheus text for *.prom, JSON otherwise"""
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w") as f:
+            f.write(text)
+
+
+registry = Registry()
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = flag
+
+
+def is_enabled():
+    return _enabled
+
+
+def instrument(name, rows=None):
+    """Decorator recording each call as operation `name`
+
+    rows(result) gives the row count for the call (e.g. len for fetched lists).
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                registry.record(name, time.perf_counter() - started, error=True)
+                raise
+            registry.record(name, time.perf_counter() - started, rows(result) if rows else 0)
+            return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def timer(name, rows=0):
+    """Record the enclosed block as operation `name`"""
+    if not _enabled:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException:
+        registry.record(name, time.perf_counter() - started, rows, error=True)
+        raise
+    registry.record(name, time.perf_counter() - started, rows)
+
+
+def _enable_from_env():
+    path = os.environ.get("SCHOOL_METRICS")
+    if path:
+        enable()
+        atexit.register(registry.dump, path)
+
+
+_enable_from_env()
@@ -0,0 +1,106 @@
+# PROFILING
+# --profile support shared by "school system.py" and "school project.py":
+# cProfile hotspots, tracemalloc allocation sites and an optional sampling
+# timer, all written to one text report.
+
+import sys
+import threading
+import time
+from collections import Counter
+
+
+def add_arguments(parser):
+    """Add the --profile family of options to an argparse parser"""
+    group = parser.add_argument_group("profiling")
+    group.add_argument("--profile", metavar="REPORT", nargs="?", const="profile_report.txt",
+                       help="profile the run and write a report (default: profile_report.txt)")
+    group.add_argument("--profile-top", type=int, default=25, metavar="N",
+                       help="hotspots to list per section (default: 25)")
+    group.add_argument("--profile-sample-ms", type=float, metavar="MS",
+                       help="also sample the main thread's stack every MS milliseconds")
+    group.add_argument("--no-tracemalloc", action="store_true",
+                       help="skip the allocation report (tracemalloc slows the run down)")
+    group.add_argument("--synthetic", type=int, metavar="N",
+                       help="run a synthetic workload of N people instead of the normal program")
+
+
+class StackSampler:
+    """Background thread that records where the target thread is every interval"""
+
+    def __init__(self, interval, thread_id=None, depth=3):
+        self.interval = interval
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.depth = depth
+        self.samples = Counter()
+        self.total = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.depth:
+                code = frame.f_code
+                stack.append(f"{code.co_filename}:{frame.f_lineno}({code.co_name})")
+                frame = frame.f_back
+            self.samples[" <- ".join(stack)] += 1
+            self.total += 1
+
+    def report(self, top):
+        lines = [f"{self.total} samples every {self.interval * 1000:g}ms"]
+        for stack, count in self.samples.most_common(top):
+            lines.append(f"{count:>7} {count / self.total:6.1%}  {stack}")
+        return "\n".join(lines)
+
+
+def run_profiled(fn, args, *fn_args):
+    """Run fn(*fn_args) under the profilers selected in args and write the report"""
+    # Imported here: pstats alone pulls in dataclasses and inspect, which every
+    # unprofiled start-up would otherwise pay for
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+    sampler = None
+    if args.profile_sample_ms:
+        sampler = StackSampler(args.profile_sample_ms / 1000)
+        sampler.start()
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+    profiler = cProfile.Profile()
+    started = time.perf_counter()
+    try:
+        result = profiler.runcall(fn, *fn_args)
+    finally:
+        elapsed = time.perf_counter() - started
+        sections = [f"Profile of {' '.join(sys.argv)}", f"Wall time: {elapsed:.3f}s"]
+        if not args.no_tracemalloc:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        for sort_key in ("cumulative", "tottime"):
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).strip_dirs().sort_stats(sort_key).print_stats(args.profile_top)
+            sections.append(f"== cProfile: top {args.profile_top} by {sort_key} ==\n{out.getvalue().strip()}")
+        if not args.no_tracemalloc:
+            lines = [f"current {current / 1024:.1f} KiB, peak {peak / 1024:.1f} KiB"]
+            for stat in snapshot.statistics("lineno")[:args.profile_top]:
+                lines.append(str(stat))
+            sections.append(f"== tracemalloc: top {args.profile_top} allocation sites ==\n" + "\n".join(lines))
+        if sampler is not None:
+            sampler.stop()
+            sections.append(f"== sampled stacks ==\n{sampler.report(args.profile_top)}")
+        with open(args.profile, "w") as f:
+            f.write("\n\n".join(sections) + "\n")
+        print(f"Profile report written to {args.profile}", file=sys.stderr)
+    return result
@@ -0,0 +1,41 @@
+# REPORT WORKER
+# Process-pool entry point for School.generate_all_reports in "school system.py".
+#
+# Worker processes find the function they run by importing its module by
+# name. "school system.py" cannot be imported by name (its file name has a
+# space), so under the spawn and forkserver start methods the workers would
+# fail; they import this module instead and it loads the script by path.
+
+import importlib.util
+import os
+import sys
+
+SCHOOL_SYSTEM_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "school system.py")
+
+
+def _load_school_system():
+    """The running "school system.py" module, loaded on first use in a fresh worker"""
+    # Run as a script, the parent's module is __main__; spawned workers
+    # re-run it as __mp_main__ under that alias, so reuse it when it is ours
+    for name in ("school_system", "__main__"):
+        module = sys.modules.get(name)
+        if module is not None and os.path.abspath(getattr(module, "__file__", "")) == SCHOOL_SYSTEM_PATH:
+            return module
+    spec = importlib.util.spec_from_file_location("school_system", SCHOOL_SYSTEM_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["school_system"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def render_student_reports(rows):
+    """Render reports for one chunk of (id, name, age, phone, grade, class, grades) rows"""
+    system = _load_school_system()
+    generator = system.ReportGenerator(None)
+    reports = []
+    for *fields, grades in rows:
+        student = system.Student(*fields)
+        for subject, grade in grades.items():
+            student.add_grade(subject, grade)
+        reports.append((fields[0], generator.generate_student_report(student)))
+    return reports
@@ -1,119 +1,264 @@
+import argparse
+import atexit
+import csv
+import os
+import queue
+import random
 import sqlite3
-import tkinter as tk
-from tkinter import ttk, messagebox
-
-# Database Functions
-def init_db():
-    conn=sqlite3.connect("school.db")
-    cursor=conn.cursor()
-    cursor.execute("""create table if not exists students (
-                        id text primary key,
-                        name text,
-                        age integer,
-                        phone text,
-                        grade integer,
-                        student_class text)""")
-    cursor.execute(""" create table if not exists teachers (
-                        id text primary key,
-                        name text,
-                        age integer,
-                        phone text,
-                        subject text,
-                        salary real)""")
-    cursor.execute("""create table if not exists feedback (
-                        id integer primary key autoincrement,
-                        person_id text,
-                        role text,
-                        comment text)""")
-    conn.commit()
-    conn.close()
-
-def add_student_to_db(s):
-    conn=sqlite3.connect("school.db")
-    cursor=conn.cursor()
-    cursor.execute("""insert  into students (id,name,age,phone,grade,student_class)
-                      values (?,?,?,?,?,?)""",
-                   (s.id,s.name,s.age,s.phone,s.grade,s.student_class))
-    conn.commit()
-    conn.close()
-
-def add_teacher_to_db(t):
-    conn=sqlite3.connect("school.db")
-    cursor=conn.cursor()
-    cursor.execute("""insert into teacher (id,name,age,phone,subject,salary)
-                      values (?,?,?,?,?,?)""",
-                   (t.id,t.name,t.age,t.phone,t.subject,t.salary))
-    conn.commit()
-    conn.close()
-
-def add_feedback(person_id,role,comment):
-    conn=sqlite3.connect("school.db")
-    cursor=conn.cursor()
-    cursor.execute("insert into feedback (person_id,role,comment) values (?,?,?)",
-                   (person_id,role,comment))
-    conn.commit()
-    conn.close()
-
-def load_students():
-    conn=sqlite3.connect("school.db")
-    cursor=conn.cursor()
-    cursor.execute("select * from students order by id")
-    rows=cursor.fetchall()
-    conn.close()
-    return rows
-
-def load_teachers():
-    conn=sqlite3.connect("school.db")
-    cursor=conn.cursor()
-    cursor.execute("select * from teachers order by id")
-    rows=cursor.fetchall()
-    conn.close()
-    return rows
-
-def load_feedback():
-    conn=sqlite3.connect("school.db")
-    cursor=conn.cursor()
-    cursor.execute("select * from feedback order by id DESC")
-    rows=cursor.fetchall()
-    conn.close()
-    return rows
-
-#  Classes
-class Student:
-    def __init__(self,id,name,age,phone,grade,student_class):
-        self.id=id
-        self.name=name
-        self.age=age
-        self.phone=phone
-        self.grade=grade
-        self.student_class=student_class
-        self.grades={}
-
-    def add_grade(self,subject,grade):
-        if 0<=grade<=100:
-            self.grades[subject]=grade
-
-    def average(self):
-        return sum(self.grades.values())/len(self.grades) if self.grades else 0
-
-class Teacher:
-    def __init__(self,id,name,age,phone,subject,salary):
-        self.id=id
-        self.name=name
-        self.age=age
-        self.phone=phone
-        self.subject=subject
-        self.salary=salary
-        self.classes=[]
+import sys
+import tempfile
+import threading
+import time
+
+import metrics
+import profiling
+from school_db import (DB_PATH,EXPORTS,EXPORT_FORMATS,FEEDBACK_FIELDS,IMPORT_KINDS,INSERT_FEEDBACK,INSERT_STUDENT,
+                       INSERT_TEACHER,LISTINGS,PAGE_SIZE,PAYROLL_BRACKETS,STUDENT_FIELDS,TEACHER_FIELDS,UPSERT_GRADE,
+                       Student,Teacher,add_feedback,add_grade_to_db,bulk_import,close_db,configure_db,export_table,
+                       find_student,find_teacher,get_connection,import_csv,init_db,iter_pages,load_feedback,
+                       load_feedback_page,load_grades,load_student_averages_page,load_students,load_teachers,
+                       load_teachers_page,note_write,parse_brackets,payroll,search_feedback,student_row,teacher_row)
+
+# tkinter is imported on first use, so the data layer and the headless
+# commands start fast and run on machines without Tk
+tk=ttk=messagebox=None
+
+def load_tk():
+    global tk,ttk,messagebox
+    if tk is None:
+        import tkinter
+        from tkinter import ttk as _ttk,messagebox as _messagebox
+        tk,ttk,messagebox=tkinter,_ttk,_messagebox
+    return tk
+
+#  Background Worker
+class DBJob:
+    def __init__(self,fn=None,args=(),sql=None,params=None,on_done=None,on_error=None):
+        self.fn=fn
+        self.args=args
+        self.sql=sql
+        self.params=params
+        self.on_done=on_done
+        self.on_error=on_error
+
+class DBWorker:
+    """Runs database calls on one background thread; callbacks run on the Tk thread via root.after polling."""
+    def __init__(self,root,poll_ms=50,batch_window=0.02,on_busy=None):
+        self.root=root
+        self.poll_ms=poll_ms
+        self.batch_window=batch_window
+        self.on_busy=on_busy
+        self.pending=0
+        self._busy=False
+        self._requests=queue.Queue()
+        self._results=queue.Queue()
+        self._thread=threading.Thread(target=self._run,name="db-worker",daemon=True)
+        self._thread.start()
+        self._poll_id=self.root.after(self.poll_ms,self._poll)
+
+    def submit(self,fn,*args,on_done=None,on_error=None):
+        """Run fn(*args) on the worker thread."""
+        self._enqueue(DBJob(fn=fn,args=args,on_done=on_done,on_error=on_error))
+
+    def submit_write(self,sql,params,on_done=None,on_error=None):
+        """Queue one insert/update; writes queued close together share a transaction."""
+        self._enqueue(DBJob(sql=sql,params=params,on_done=on_done,on_error=on_error))
+
+    def _enqueue(self,job):
+        self.pending+=1
+        self._set_busy(True)
+        self._requests.put(job)
+
+    def _set_busy(self,busy):
+        # only report changes; _poll runs every poll_ms even when idle
+        if busy!=self._busy:
+            self._busy=busy
+            if self.on_busy:
+                self.on_busy(busy)
+
+    def stop(self):
+        self._requests.put(None)
+        self._thread.join()
+        try:
+            self.root.after_cancel(self._poll_id)
+        except tk.TclError:
+            pass  # root already destroyed
+
+    def _run(self):
+        carry=None
+        while True:
+            job=carry if carry is not None else self._requests.get()
+            carry=None
+            if job is None:
+                return
+            if job.sql is None:
+                self._run_call(job)
+                continue
+            batch=[job]
+            deadline=time.monotonic()+self.batch_window
+            while True:
+                try:
+                    nxt=self._requests.get(timeout=max(0.0,deadline-time.monotonic()))
+                except queue.Empty:
+                    break
+                if nxt is None or nxt.sql is None:
+                    carry=nxt
+                    break
+                batch.append(nxt)
+            self._run_writes(batch)
+
+    def _run_call(self,job):
+        try:
+            self._results.put((job,job.fn(*job.args),None))
+        except Exception as e:
+            self._results.put((job,None,e))
+
+    def _run_writes(self,batch):
+        with metrics.timer("db.worker_batch",rows=len(batch)):
+            self._write_batch(batch)
+
+    def _write_batch(self,batch):
+        conn=get_connection()
+        outcomes=[]
+        try:
+            with conn:
+                # savepoints outside a transaction commit on release, so open one
+                # explicitly and let `with conn` commit the whole batch once
+                conn.execute("begin")
+                for job in batch:
+                    # a savepoint per job lets one bad row fail alone without
+                    # rolling back the rest of the batch
+                    conn.execute("savepoint job")
+                    try:
+                        conn.execute(job.sql,job.params)
+                        conn.execute("release job")
+                        outcomes.append((job,True,None))
+                    except sqlite3.Error as e:
+                        conn.execute("rollback to job")
+                        conn.execute("release job")
+                        outcomes.append((job,None,e))
+        except sqlite3.Error as e:
+            outcomes=[(job,None,e) for job in batch]
+        finally:
+            note_write()
+        for outcome in outcomes:
+            self._results.put(outcome)
+
+    def _poll(self):
+        while True:
+            try:
+                job,result,error=self._results.get_nowait()
+            except queue.Empty:
+                break
+            self.pending-=1
+            if error is None:
+                if job.on_done:
+                    job.on_done(result)
+            elif job.on_error:
+                job.on_error(error)
+            else:
+                messagebox.showerror("Database Error",str(error))
+        if self.pending==0:
+            self._set_busy(False)
+        self._poll_id=self.root.after(self.poll_ms,self._poll)
 
 #  GUI
+class PagedTree:
+    """Treeview that pulls rows in pages from fetch(last_id,limit) as the user scrolls near the end."""
+    def __init__(self,parent,columns,width,fetch,to_values=tuple,page_size=PAGE_SIZE,prefetch=0.8,worker=None):
+        load_tk()
+        self.fetch=fetch
+        self.worker=worker
+        self.to_values=to_values
+        self.page_size=page_size
+        self.prefetch=prefetch
+        self.last_id=None
+        self.done=False
+        self._pending=False
+        self._generation=0
+        self.tree=ttk.Treeview(parent)
+        self.tree["columns"]=columns
+        self.tree.heading("#0",text="")
+        self.tree.column("#0",width=0)
+        for col in columns:
+            self.tree.heading(col,text=col)
+            self.tree.column(col,width=width)
+        self.scrollbar=ttk.Scrollbar(parent,orient="vertical",command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side="right",fill="y")
+        self.tree.pack(fill="both",expand=True)
+        self.load_more()
+
+    def _on_scroll(self,first,last):
+        self.scrollbar.set(first,last)
+        # fetch the next page once the visible window gets into the prefetch margin
+        if not self.done and not self._pending and float(last)>=self.prefetch:
+            self._pending=True
+            self.tree.after_idle(self.load_more)
+
+    def load_more(self):
+        if self.done:
+            self._pending=False
+            return
+        if self.worker is None:
+            self._add_rows(self.fetch(self.last_id,self.page_size))
+        else:
+            self._pending=True
+            generation=self._generation
+            self.worker.submit(self.fetch,self.last_id,self.page_size,
+                               on_done=lambda rows:self._add_rows(rows,generation))
+
+    def _add_rows(self,rows,generation=None):
+        # drop pages requested before the last reset/show_rows
+        if generation is not None and generation!=self._generation:
+            return
+        self._pending=False
+        if not self.tree.winfo_exists():
+            return
+        if len(rows)<self.page_size:
+            self.done=True
+        with metrics.timer("gui.treeview_insert",rows=len(rows)):
+            for r in rows:
+                self.tree.insert("", "end", values=self.to_values(r))
+        if rows:
+            self.last_id=rows[-1][0]
+
+    def reset(self):
+        self._generation+=1
+        self._pending=False
+        self.tree.delete(*self.tree.get_children())
+        self.last_id=None
+        self.done=False
+        self.load_more()
+
+    def show_rows(self,rows):
+        """Replace the paged contents with a fixed result set."""
+        self._generation+=1
+        self._pending=False
+        self.tree.delete(*self.tree.get_children())
+        self.done=True
+        for r in rows:
+            self.tree.insert("", "end", values=self.to_values(r))
+
 class SchoolGUI:
     def __init__(self,root):
+        load_tk()
         self.root=root
         self.root.title("School Management System")
         self.root.geometry("900x600")
         self.root.configure(bg= "tan")
         self.create_widgets()
+        self.worker=DBWorker(root,on_busy=self.set_busy)
+
+    def set_busy(self,busy):
+        if busy:
+            self.status.config(text="Working...")
+            self.progress.pack(pady=5)
+            self.progress.start(10)
+        else:
+            self.status.config(text="")
+            self.progress.stop()
+            self.progress.pack_forget()
 
     def create_widgets(self):
         tk.Label(self.root,text="Backline school",font=("Arial",24,"bold"),
@@ -134,8 +279,15 @@ class SchoolGUI:
                   command=self.add_feedback_window).grid(row=1,column=1,padx=5,pady=5)
         tk.Button(frame,text="Show Feedback",width=18,bg="lightcoral",fg="gray",
                   command=self.show_feedback).grid(row=1,column=2,padx=5,pady=5)
+        tk.Button(frame,text="Add Grade",width=18,bg="dark green",fg="light gray",
+                  command=self.add_grade_window).grid(row=2,column=1,padx=5,pady=5)
+
+        self.status=tk.Label(self.root,text="",bg="tan")
+        self.status.pack()
+        self.progress=ttk.Progressbar(self.root,mode="indeterminate",length=200)
 
     #  Student Window
+    @metrics.instrument("gui.add_student_window")
     def add_student_window(self):
         win=tk.Toplevel(self.root)
         win.title("Add Student")
@@ -148,16 +300,19 @@ class SchoolGUI:
             e.pack()
             entries[l]=e
 
+        @metrics.instrument("gui.add_student_action")
         def add_student_action():
             s=Student(entries["ID"].get(),entries["Name"].get(),int(entries["Age"].get()),
                       entries["Phone"].get(),int(entries["Grade"].get()),entries["Class"].get())
-            add_student_to_db(s)
-            messagebox.showinfo("Success",f"Student {s.name} added!")
-            win.destroy()
+            def done(_):
+                messagebox.showinfo("Success",f"Student {s.name} added!")
+                win.destroy()
+            self.worker.submit_write(INSERT_STUDENT,student_row(s),on_done=done)
 
         tk.Button(win,text="Add Student",bg="navyblue",fg="white",command=add_student_action).pack(pady=10)
 
     #  Teacher Window
+    @metrics.instrument("gui.add_teacher_window")
     def add_teacher_window(self):
         win=tk.Toplevel(self.root)
         win.title("Add Teacher")
@@ -170,49 +325,71 @@ class SchoolGUI:
             e.pack()
             entries[l]=e
 
+        @metrics.instrument("gui.add_teacher_action")
         def add_teacher_action():
             t=Teacher(entries["ID"].get(),entries["Name"].get(),int(entries["Age"].get()),
                       entries["Phone"].get(),entries["Subject"].get(),float(entries["Salary"].get()))
-            add_teacher_to_db(t)
-            messagebox.showinfo("Success",f"Teacher {t.name} added!")
-            win.destroy()
+            def done(_):
+                messagebox.showinfo("Success",f"Teacher {t.name} added!")
+                win.destroy()
+            self.worker.submit_write(INSERT_TEACHER,teacher_row(t),on_done=done)
 
         tk.Button(win,text="Add Teacher",bg="blue",fg="white",command=add_teacher_action).pack(pady=10)
 
+    #  Grade Window
+    @metrics.instrument("gui.add_grade_window")
+    def add_grade_window(self):
+        win=tk.Toplevel(self.root)
+        win.title("Add Grade")
+        win.geometry("400x250")
+        labels=["Student ID","Subject","Grade"]
+        entries={}
+        for l in labels:
+            tk.Label(win,text=l).pack()
+            e=tk.Entry(win)
+            e.pack()
+            entries[l]=e
+
+        @metrics.instrument("gui.add_grade_action")
+        def add_grade_action():
+            grade=float(entries["Grade"].get())
+            if not 0<=grade<=100:
+                messagebox.showerror("Invalid Grade","Grade must be between 0 and 100")
+                return
+            def done(_):
+                messagebox.showinfo("Success","Grade saved!")
+                win.destroy()
+            def failed(e):
+                if "no such student" in str(e):
+                    messagebox.showerror("Unknown Student",f"No student with ID {entries['Student ID'].get()!r}")
+                else:
+                    messagebox.showerror("Database Error",str(e))
+            self.worker.submit_write(UPSERT_GRADE,(entries["Student ID"].get(),entries["Subject"].get(),grade),
+                                     on_done=done,on_error=failed)
+
+        tk.Button(win,text="Add Grade",bg="dark green",fg="white",command=add_grade_action).pack(pady=10)
+
     #  Show Students
+    @metrics.instrument("gui.show_students")
     def show_students(self):
         win=tk.Toplevel(self.root)
         win.title("All Students")
         win.geometry("600x400")
-        tree=ttk.Treeview(win)
-        tree["columns"]=("ID","Name","Age","Phone","Grade","Class","Average")
-        tree.heading("#0",text="")
-        tree.column("#0",width=0)
-        for col in tree["columns"]:
-            tree.heading(col,text=col)
-            tree.column(col,width=80)
-        tree.pack(fill="both",expand=True)
-        for r in load_students():
-            s=Student(*r)
-            tree.insert("", "end", values=(s.id,s.name,s.age,s.phone,s.grade,s.student_class,f"{s.average():.2f}"))
+        def student_values(r):
+            return r[:6]+(f"{r[6]:.2f}",)
+        PagedTree(win,("ID","Name","Age","Phone","Grade","Class","Average"),80,
+                  load_student_averages_page,student_values,worker=self.worker)
 
     #  Show Teachers
+    @metrics.instrument("gui.show_teachers")
     def show_teachers(self):
         win=tk.Toplevel(self.root)
         win.title("All Teachers")
         win.geometry("600x400")
-        tree=ttk.Treeview(win)
-        tree["columns"]=("ID","Name","Age","Phone","Subject","Salary")
-        tree.heading("#0",text="")
-        tree.column("#0",width=0)
-        for col in tree["columns"]:
-            tree.heading(col,text=col)
-            tree.column(col,width=90)
-        tree.pack(fill="both",expand=True)
-        for r in load_teachers():
-            tree.insert("", "end", values=r)
+        PagedTree(win,("ID","Name","Age","Phone","Subject","Salary"),90,load_teachers_page,worker=self.worker)
 
     #  Feedback
+    @metrics.instrument("gui.add_feedback_window")
     def add_feedback_window(self):
         win=tk.Toplevel(self.root)
         win.title("Add Feedback")
@@ -223,35 +400,239 @@ class SchoolGUI:
         role_entry=tk.Entry(win); role_entry.pack()
         tk.Label(win,text="Comment").pack()
         comment_entry=tk.Text(win,height=5); comment_entry.pack()
+        @metrics.instrument("gui.save_feedback")
         def save_feedback():
-            add_feedback(id_entry.get(),role_entry.get(),comment_entry.get("1.0",tk.END).strip())
-            messagebox.showinfo("Success","Feedback added!")
-            win.destroy()
+            def done(_):
+                messagebox.showinfo("Success","Feedback added!")
+                win.destroy()
+            self.worker.submit_write(INSERT_FEEDBACK,(id_entry.get(),role_entry.get(),
+                                     comment_entry.get("1.0",tk.END).strip()),on_done=done)
         tk.Button(win,text="Add Feedback",bg="firebrick",fg="white",command=save_feedback).pack(pady=10)
 
+    @metrics.instrument("gui.show_feedback")
     def show_feedback(self):
         win=tk.Toplevel(self.root)
         win.title("All Feedback")
         win.geometry("600x400")
-        tree=ttk.Treeview(win)
-        tree["columns"]=("ID","Person ID","Role","Comment")
-        tree.heading("#0",text="")
-        tree.column("#0",width=0)
-        for col in tree["columns"]:
-            tree.heading(col,text=col)
-            tree.column(col,width=120)
-        tree.pack(fill="both",expand=True)
-        for r in load_feedback():
-            tree.insert("", "end", values=r)
+        search_frame=tk.Frame(win)
+        search_frame.pack(fill="x")
+        tk.Label(search_frame,text="Search").pack(side="left",padx=5)
+        search_entry=tk.Entry(search_frame)
+        search_entry.pack(side="left",fill="x",expand=True,padx=5,pady=5)
+        paged=PagedTree(win,("ID","Person ID","Role","Comment"),120,load_feedback_page,worker=self.worker)
+        state={"after":None,"seq":0}
+
+        def run_search():
+            state["after"]=None
+            text=search_entry.get().strip()
+            if not text:
+                paged.reset()
+                return
+            state["seq"]+=1
+            seq=state["seq"]
+            def done(rows):
+                # ignore answers to queries the user has already typed past
+                if seq==state["seq"] and win.winfo_exists():
+                    paged.show_rows(rows)
+            self.worker.submit(search_feedback,text,on_done=done)
+
+        def on_key(_):
+            # debounce: search once typing pauses instead of on every keystroke
+            if state["after"] is not None:
+                win.after_cancel(state["after"])
+            state["after"]=win.after(250,run_search)
+
+        search_entry.bind("<KeyRelease>",on_key)
 
 #  Main
-if __name__=="__main__":
-    init_db()
-    root=tk.Tk()
+def run_synthetic_load(n,seed=42):
+    """Fill the current database with n synthetic people and read it back the way the GUI does."""
+    rng=random.Random(seed)
+    subjects=("Math","English","Science","History","Art")
+    classes=[f"{level}-{section}" for level in range(1,13) for section in "ABC"]
+    words=("late","homework","library","cafeteria","exam","bus","sports","projector","grades","noise")
+    teachers=max(1,n//21)
+    students=n-teachers
+    print(bulk_import("students",((i,{"id":f"S{i:07d}","name":f"Student {i}","age":str(rng.randint(6,18)),
+                                     "phone":"0123456789","grade":str(rng.randint(1,12)),
+                                     "student_class":rng.choice(classes)}) for i in range(students))).summary())
+    print(bulk_import("teachers",((i,{"id":f"T{i:06d}","name":f"Teacher {i}","age":str(rng.randint(25,65)),
+                                     "phone":"0111111111","subject":rng.choice(subjects),
+                                     "salary":str(rng.randrange(3000,9000,50))}) for i in range(teachers))).summary())
+    for i in range(min(students,5000)):
+        for subject in rng.sample(subjects,3):
+            add_grade_to_db(f"S{i:07d}",subject,rng.randint(30,100))
+        add_feedback(f"S{i:07d}","Student"," ".join(rng.choices(words,k=6)))
+    for fetch in (load_student_averages_page,load_teachers_page,load_feedback_page):
+        for _ in iter_pages(fetch):
+            pass
+    for word in words:
+        search_feedback(word[:3])
+    print(f"Loaded {len(load_students())} students, {len(load_teachers())} teachers, "
+          f"{len(load_feedback())} feedback rows")
+    return 0
+
+#  Headless commands
+def print_rows(columns,rows,out=sys.stdout):
+    writer=csv.writer(out,delimiter="\t",lineterminator="\n")
+    writer.writerow(columns)
+    writer.writerows(rows)
+
+def cmd_add(args):
+    if args.kind in ("student","teacher"):
+        fields=STUDENT_FIELDS if args.kind=="student" else TEACHER_FIELDS
+        result=bulk_import(args.kind+"s",[(1,{f:getattr(args,f) for f in fields})])
+        if result.rejected:
+            print(f"{args.kind} not added: {result.rejected[0][1]}",file=sys.stderr)
+            return 1
+    elif args.kind=="grade":
+        try:
+            added=add_grade_to_db(args.student_id,args.subject,args.grade)
+        except ValueError as e:
+            print(f"grade not added: {e}",file=sys.stderr)
+            return 1
+        if not added:
+            print("grade must be between 0 and 100",file=sys.stderr)
+            return 1
+    else:
+        add_feedback(args.person_id,args.role,args.comment)
+    print(f"Added {args.kind}")
+    return 0
+
+def cmd_list(args):
+    fetch,columns=LISTINGS[args.kind]
+    print_rows(columns,fetch(args.after,args.limit))
+    return 0
+
+def cmd_query(args):
+    if args.kind=="student":
+        columns,rows=STUDENT_FIELDS,[find_student(args.value)]
+    elif args.kind=="teacher":
+        columns,rows=TEACHER_FIELDS,[find_teacher(args.value)]
+    elif args.kind=="grades":
+        columns,rows=("subject","grade"),load_grades(args.value)
+    else:
+        columns,rows=FEEDBACK_FIELDS,search_feedback(args.value,args.limit)
+    rows=[r for r in rows if r is not None]
+    if not rows:
+        print(f"no {args.kind} matching {args.value!r}",file=sys.stderr)
+        return 1
+    print_rows(columns,rows)
+    return 0
+
+def cmd_export(args):
+    try:
+        result=export_table(args.kind,args.output,args.format,args.chunk_size)
+    except BrokenPipeError:
+        # stdout closed early (e.g. piped into head); keep Python from complaining at exit
+        sys.stdout=open(os.devnull,"w")
+        return 1
+    print(result.summary(),file=sys.stderr)
+    return 0
+
+def cmd_payroll(args):
+    try:
+        brackets=parse_brackets(args.brackets) if args.brackets else PAYROLL_BRACKETS
+    except ValueError as e:
+        print(e,file=sys.stderr)
+        return 1
+    result=payroll(brackets,args.progressive)
+    rows=[("subject",name,r["teachers"],r["gross"],r["tax"],r["net"]) for name,r in result["by_subject"].items()]
+    rows+=[("band",name,r["teachers"],r["gross"],r["tax"],r["net"]) for name,r in result["by_band"].items()]
+    rows.append(("total","",result["teachers"],result["gross"],result["tax"],result["net"]))
+    print_rows(("scope","name","teachers","gross","tax","net"),
+               [row[:3]+tuple(f"{v:.2f}" for v in row[3:]) for row in rows])
+    return 0
+
+def add_headless_commands(sub):
+    add=sub.add_parser("add",help="add one record")
+    kinds=add.add_subparsers(dest="kind",required=True)
+    for kind,fields in (("student",STUDENT_FIELDS),("teacher",TEACHER_FIELDS)):
+        p=kinds.add_parser(kind)
+        for f in fields:
+            p.add_argument(f)
+    p=kinds.add_parser("grade")
+    p.add_argument("student_id")
+    p.add_argument("subject")
+    p.add_argument("grade",type=float)
+    p=kinds.add_parser("feedback")
+    p.add_argument("person_id")
+    p.add_argument("role",choices=("Student","Teacher"))
+    p.add_argument("comment")
+    add.set_defaults(handler=cmd_add)
+    lst=sub.add_parser("list",help="print one page of a table as tab-separated rows")
+    kinds=lst.add_subparsers(dest="kind",required=True)
+    for kind in sorted(LISTINGS):
+        p=kinds.add_parser(kind)
+        p.add_argument("--limit",type=int,default=PAGE_SIZE)
+        if kind=="feedback":  # pages newest first by integer id
+            p.add_argument("--after",type=int,metavar="ID",help="start before this id")
+        else:
+            p.add_argument("--after",metavar="ID",help="start after this id")
+    lst.set_defaults(handler=cmd_list)
+    qry=sub.add_parser("query",help="look up a student, teacher, a student's grades, or search feedback")
+    qry.add_argument("kind",choices=("student","teacher","grades","feedback"))
+    qry.add_argument("value",help="id, or search text for feedback")
+    qry.add_argument("--limit",type=int,default=PAGE_SIZE)
+    qry.set_defaults(handler=cmd_query)
+    exp=sub.add_parser("export",help="stream a whole table as CSV, JSON Lines or compressed columns")
+    exp.add_argument("kind",choices=sorted(EXPORTS))
+    exp.add_argument("-o","--output",metavar="PATH",help="write here instead of stdout")
+    exp.add_argument("--format",choices=sorted(set(EXPORT_FORMATS.values())),
+                     help="default: from the output extension (.csv, .jsonl, .cols), else csv")
+    exp.add_argument("--chunk-size",type=int,default=5000,help="rows fetched per fetchmany call")
+    exp.set_defaults(handler=cmd_export)
+    pay=sub.add_parser("payroll",help="tax and net pay for all teachers, per subject and tax band")
+    pay.add_argument("--brackets",metavar="LOW:RATE,...",help="tax bands, e.g. 0:0.1,5000:0.15 (the default)")
+    pay.add_argument("--progressive",action="store_true",help="tax each slice at its band's rate instead of the whole salary")
+    pay.set_defaults(handler=cmd_payroll)
+
+def run_command(args):
+    if getattr(args,"handler",None):
+        return args.handler(args)
+    if args.command=="import":
+        result=import_csv(args.kind,args.csv_path,args.chunk_size)
+        print(result.summary())
+        for line,reason in result.rejected:
+            print(f"  line {line}: {reason}",file=sys.stderr)
+        return 1 if result.rejected else 0
+    root=load_tk().Tk()
     app=SchoolGUI(root)
     root.mainloop()
+    app.worker.stop()
+    return 0
 
+def run_cli(argv):
+    parser=argparse.ArgumentParser(description="School Management System")
+    parser.add_argument("--db",help=f"path to the SQLite database (default: {DB_PATH}; a temporary file with --synthetic)")
+    parser.add_argument("--metrics",metavar="PATH",help="record metrics and write them to PATH on exit (.prom for Prometheus text, else JSON)")
+    profiling.add_arguments(parser)
+    sub=parser.add_subparsers(dest="command")
+    imp=sub.add_parser("import",help="bulk import students or teachers from CSV")
+    imp.add_argument("kind",choices=sorted(IMPORT_KINDS))
+    imp.add_argument("csv_path")
+    imp.add_argument("--chunk-size",type=int,default=5000)
+    add_headless_commands(sub)
+    args=parser.parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+        atexit.register(metrics.registry.dump,args.metrics)
+    with tempfile.TemporaryDirectory() as scratch:
+        db=args.db or (os.path.join(scratch,"synthetic.db") if args.synthetic else DB_PATH)
+        configure_db(db)
+        try:
+            if args.synthetic:
+                target,target_args=run_synthetic_load,(args.synthetic,)
+            else:
+                target,target_args=run_command,(args,)
+            def run():
+                init_db()
+                return target(*target_args)
+            if args.profile:
+                return profiling.run_profiled(run,args)
+            return run()
+        finally:
+            close_db()
 
-
-             
-           
+if __name__=="__main__":
+    sys.exit(run_cli(sys.argv[1:]))
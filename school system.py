@@ -2,7 +2,35 @@
 # Demonstrates all OOP and SOLID Principles
 
 
+import argparse
+import asyncio
+import atexit
+import csv
+import json
+import math
+import os
+import random
+import mmap
+import sqlite3
+import struct
+import sys
+import threading
+import time
 from abc import ABC, abstractmethod
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import chain, islice
+from bisect import bisect_left, bisect_right, insort
+
+import metrics
+import profiling
+import report_worker
+import school_db
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch grading falls back to bisect
+    np = None
 
 
 # PERSON CLASS - Abstract Base Class
@@ -12,6 +40,9 @@ from abc import ABC, abstractmethod
 class Person(ABC):
     """Abstract base class for all people in school"""
     
+    # No per-instance __dict__; keeps large schools small in memory
+    __slots__ = ("_person_id", "_name", "_age", "_phone", "_name_listeners", "_change_listeners")
+    
     # Class attribute
     total_people = 0
     
@@ -21,6 +52,8 @@ class Person(ABC):
         self._name = name
         self._age = age
         self._phone = phone
+        self._name_listeners = ()
+        self._change_listeners = ()
         Person.total_people += 1
     
     # Getter methods
@@ -38,10 +71,29 @@ class Person(ABC):
     
     # Setter methods
     def set_name(self, name):
+        old_name = self._name
         self._name = name
+        for listener in self._name_listeners:
+            listener(self, old_name)
+        if self._change_listeners:
+            self._notify_change("name", name)
+    
+    def add_name_listener(self, listener):
+        """Call listener(person, old_name) whenever the name changes"""
+        self._name_listeners += (listener,)
     
     def set_phone(self, phone):
         self._phone = phone
+        if self._change_listeners:
+            self._notify_change("phone", phone)
+    
+    def add_change_listener(self, listener):
+        """Call listener(person, change, value) after any mutation"""
+        self._change_listeners += (listener,)
+    
+    def _notify_change(self, change, value):
+        for listener in self._change_listeners:
+            listener(self, change, value)
     
     # Abstract methods (must be implemented by child classes)
     @abstractmethod
@@ -73,6 +125,8 @@ class Person(ABC):
 class Student(Person):
     """Student class that inherits from Person"""
     
+    __slots__ = ("_grade", "_student_class", "_grades", "_grade_total", "_gpa_cache")
+    
     # Class attribute
     total_students = 0
     
@@ -81,7 +135,11 @@ class Student(Person):
         super().__init__(person_id, name, age, phone)
         self._grade = grade
         self._student_class = student_class
-        self._grades = {}
+        self._grades = None  # a dict from the first add_grade on
+        # Running total for O(1) averages; the cached GPA is dropped on every
+        # grade mutation
+        self._grade_total = 0
+        self._gpa_cache = None
         Student.total_students += 1
     
     # Getter methods
@@ -92,13 +150,29 @@ class Student(Person):
         return self._student_class
     
     def get_grades(self):
-        return self._grades.copy()
+        grades = self._grades
+        return grades.copy() if grades is not None else {}
+    
+    def get_grade_values(self):
+        """Read-only view of grade values (no copy)"""
+        grades = self._grades
+        return grades.values() if grades is not None else ()
     
     # Instance methods
     def add_grade(self, subject, grade):
         """Add or update grade for a subject"""
         if 0 <= grade <= 100:
-            self._grades[subject] = grade
+            grades = self._grades
+            if grades is None:
+                grades = self._grades = {}
+            old_grade = grades.get(subject)
+            if old_grade is not None:
+                self._grade_total -= old_grade
+            grades[subject] = grade
+            self._grade_total += grade
+            self._gpa_cache = None
+            if self._change_listeners:
+                self._notify_change("grade", (subject, grade, old_grade))
             return True
         return False
     
@@ -106,19 +180,30 @@ class Student(Person):
         """Calculate average grade"""
         if not self._grades:
             return 0
-        return sum(self._grades.values()) / len(self._grades)
+        return self._grade_total / len(self._grades)
+    
+    def calculate_gpa(self, calculator):
+        """GPA from calculator, cached until the grades change"""
+        cache = self._gpa_cache
+        if cache is not None and cache[0] is calculator:
+            return cache[1]
+        gpa = calculator.calculate_gpa(self._grades or {})
+        self._gpa_cache = (calculator, gpa)
+        return gpa
+    
+    # Compiled once for the class instead of concatenated on every call
+    _INFO_TEMPLATE = ("ID: {}\nName: {}\nAge: {}\nPhone: {}\n"
+                      "Grade: {}\nClass: {}\nAverage: {:.2f}")
+    _INFO_FORMAT = _INFO_TEMPLATE.format
+    
+    def _info_fields(self):
+        return (self._person_id, self._name, self._age, self._phone,
+                self._grade, self._student_class, self.calculate_average())
     
     # Override parent methods (Polymorphism)
     def display_info(self):
         """Override display_info to show student-specific info"""
-        info = f"ID: {self._person_id}\n"
-        info += f"Name: {self._name}\n"
-        info += f"Age: {self._age}\n"
-        info += f"Phone: {self._phone}\n"
-        info += f"Grade: {self._grade}\n"
-        info += f"Class: {self._student_class}\n"
-        info += f"Average: {self.calculate_average():.2f}"
-        return info
+        return self._INFO_FORMAT(*self._info_fields())
     
     def get_role(self):
         """Override get_role method"""
@@ -143,6 +228,8 @@ class Student(Person):
 class Teacher(Person):
     """Teacher class that inherits from Person"""
     
+    __slots__ = ("_subject", "_salary", "_classes")
+    
     # Class attribute
     total_teachers = 0
     
@@ -151,7 +238,7 @@ class Teacher(Person):
         super().__init__(person_id, name, age, phone)
         self._subject = subject
         self._salary = salary
-        self._classes = []
+        self._classes = ()  # a list once the first class is assigned
         Teacher.total_teachers += 1
     
     # Getter methods
@@ -162,35 +249,43 @@ class Teacher(Person):
         return self._salary
     
     def get_classes(self):
-        return self._classes.copy()
+        return list(self._classes)
     
     # Setter method
     def set_salary(self, new_salary):
         """Update teacher salary"""
         if new_salary > 0:
             self._salary = new_salary
+            if self._change_listeners:
+                self._notify_change("salary", new_salary)
             return True
         return False
     
     # Instance methods
     def add_class(self, class_name):
         """Assign a class to this teacher"""
-        if class_name not in self._classes:
-            self._classes.append(class_name)
+        classes = self._classes
+        if class_name not in classes:
+            if not classes:
+                classes = self._classes = []
+            classes.append(class_name)
+            if self._change_listeners:
+                self._notify_change("class", class_name)
             return True
         return False
     
+    _INFO_TEMPLATE = ("ID: {}\nName: {}\nAge: {}\nPhone: {}\n"
+                      "Subject: {}\nSalary: ${}\nClasses: {}")
+    _INFO_FORMAT = _INFO_TEMPLATE.format
+    
+    def _info_fields(self):
+        return (self._person_id, self._name, self._age, self._phone, self._subject, self._salary,
+                ", ".join(self._classes) if self._classes else "None")
+    
     # Override parent methods (Polymorphism)
     def display_info(self):
         """Override display_info to show teacher-specific info"""
-        info = f"ID: {self._person_id}\n"
-        info += f"Name: {self._name}\n"
-        info += f"Age: {self._age}\n"
-        info += f"Phone: {self._phone}\n"
-        info += f"Subject: {self._subject}\n"
-        info += f"Salary: ${self._salary}\n"
-        info += f"Classes: {', '.join(self._classes) if self._classes else 'None'}"
-        return info
+        return self._INFO_FORMAT(*self._info_fields())
     
     def get_role(self):
         """Override get_role method"""
@@ -211,6 +306,390 @@ class Teacher(Person):
         return salary * 0.15
 
 
+# COLUMNAR STORE - Compact storage for very large schools
+# Demonstrates: Liskov Substitution Principle (LSP) - views work wherever
+# Student/Teacher objects do
+
+
+def _column(name):
+    """Property mapping a Person attribute onto one column of the view's store"""
+    def get(self):
+        return getattr(self._store, name)[self._row]
+    
+    def set(self, value):
+        getattr(self._store, name)[self._row] = value
+    return property(get, set)
+
+
+def _coded_column(name):
+    """Property for a string column stored as codes into an interned table"""
+    def get(self):
+        return self._store.decode(getattr(self._store, name)[self._row])
+    
+    def set(self, value):
+        getattr(self._store, name)[self._row] = self._store.encode(value)
+    return property(get, set)
+
+
+def _sparse_column(name, default):
+    """Property for a rarely-set attribute kept in a {row: value} dict"""
+    def get(self):
+        return getattr(self._store, name).get(self._row, default)
+    
+    def set(self, value):
+        if value is default:
+            getattr(self._store, name).pop(self._row, None)
+        else:
+            getattr(self._store, name)[self._row] = value
+    return property(get, set)
+
+
+def _listener_column(name):
+    """Property for a listener tuple, stored as a code into the store's listener table"""
+    def get(self):
+        return self._store._listener_sets[getattr(self._store, name)[self._row]]
+    
+    def set(self, value):
+        getattr(self._store, name)[self._row] = self._store.encode_listeners(value)
+    return property(get, set)
+
+
+class _PackedStrings:
+    """A column of strings kept as UTF-8 in one bytearray, located by offset and length
+    
+    A str object costs about 50 bytes before its text; here each row costs
+    its encoded bytes plus 8. A longer replacement is appended and the old
+    bytes are left unused, which is fine for rare edits such as renames.
+    """
+    
+    __slots__ = ("_data", "_starts", "_lengths")
+    
+    def __init__(self):
+        self._data = bytearray()
+        self._starts = array("I")
+        self._lengths = array("I")
+    
+    def __len__(self):
+        return len(self._starts)
+    
+    def append(self, value):
+        encoded = value.encode()
+        self._starts.append(len(self._data))
+        self._lengths.append(len(encoded))
+        self._data += encoded
+    
+    def __getitem__(self, row):
+        start = self._starts[row]
+        return self._data[start:start + self._lengths[row]].decode()
+    
+    def __setitem__(self, row, value):
+        encoded = value.encode()
+        if len(encoded) <= self._lengths[row]:
+            start = self._starts[row]
+            self._data[start:start + len(encoded)] = encoded
+        else:
+            self._starts[row] = len(self._data)
+            self._data += encoded
+        self._lengths[row] = len(encoded)
+
+
+class PersonStore:
+    """Shared columns: ids, names and phones packed as UTF-8, ages in a typed array
+    
+    Ids, names and phones must be strings. Lookups by id go through an
+    open-addressing hash table of row numbers instead of a dict, so no
+    per-row str key is kept alive.
+    """
+    
+    def __init__(self):
+        self._index = array("i", [0]) * 8  # row + 1 per slot, 0 = empty
+        self._ids = _PackedStrings()
+        self._names = _PackedStrings()
+        self._phones = _PackedStrings()
+        self._ages = array("H")
+        # Rows added to the same managers share one listener tuple, so the
+        # tuples live here once and each row keeps a small code
+        self._name_listener_codes = array("I")
+        self._change_listener_codes = array("I")
+        self._listener_codes = {(): 0}
+        self._listener_sets = [()]
+        # Interned table for repeated strings (class names, subjects)
+        self._codes = {}
+        self._strings = []
+    
+    def encode(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(sys.intern(value))
+        return code
+    
+    def decode(self, code):
+        return self._strings[code]
+    
+    def encode_listeners(self, listeners):
+        code = self._listener_codes.get(listeners)
+        if code is None:
+            code = self._listener_codes[listeners] = len(self._listener_sets)
+            self._listener_sets.append(listeners)
+        return code
+    
+    def _find(self, person_id):
+        """(row or None, slot) for person_id; slot is where a new row would go"""
+        index, ids = self._index, self._ids
+        mask = len(index) - 1
+        slot = hash(person_id) & mask
+        while index[slot]:
+            row = index[slot] - 1
+            if ids[row] == person_id:
+                return row, slot
+            slot = (slot + 1) & mask
+        return None, slot
+    
+    def _grow_index(self):
+        index = array("i", [0]) * (2 * len(self._index))
+        mask = len(index) - 1
+        for row in range(len(self._ids)):
+            slot = hash(self._ids[row]) & mask
+            while index[slot]:
+                slot = (slot + 1) & mask
+            index[slot] = row + 1
+        self._index = index
+    
+    def _add_person(self, person_id, name, age, phone):
+        existing, slot = self._find(person_id)
+        if existing is not None:
+            raise ValueError(f"Duplicate id: {person_id}")
+        row = len(self._ids)
+        self._index[slot] = row + 1
+        self._ids.append(person_id)
+        self._names.append(name)
+        self._phones.append(phone)
+        self._ages.append(age)
+        self._name_listener_codes.append(0)
+        self._change_listener_codes.append(0)
+        # Keep the table at most half full so probe chains stay short
+        if 2 * len(self._ids) > len(self._index):
+            self._grow_index()
+        Person.total_people += 1
+        return row
+    
+    def get(self, person_id):
+        """Get a view for person_id, or None"""
+        row, _ = self._find(person_id)
+        if row is None:
+            return None
+        return self._view_class(self, row)
+    
+    def __len__(self):
+        return len(self._ids)
+    
+    def __iter__(self):
+        for row in range(len(self._ids)):
+            yield self._view_class(self, row)
+
+
+class StudentView(Student):
+    """Student backed by a row of a StudentStore"""
+    
+    __slots__ = ("_store", "_row")
+    
+    def __init__(self, store, row):
+        # Data lives in the store; nothing to initialise or count here
+        self._store = store
+        self._row = row
+    
+    _person_id = _column("_ids")
+    _name = _column("_names")
+    _age = _column("_ages")
+    _phone = _column("_phones")
+    _name_listeners = _listener_column("_name_listener_codes")
+    _change_listeners = _listener_column("_change_listener_codes")
+    _grade = _column("_grade_levels")
+    _student_class = _coded_column("_class_codes")
+    _grades = _sparse_column("_grades", None)
+    _grade_total = _column("_grade_totals")
+    _gpa_cache = _sparse_column("_gpa_caches", None)
+
+
+class StudentStore(PersonStore):
+    """Columnar storage for students"""
+    
+    _view_class = StudentView
+    
+    def __init__(self):
+        super().__init__()
+        self._grade_levels = array("H")
+        self._class_codes = array("I")
+        self._grade_totals = array("d")
+        self._grades = {}
+        self._gpa_caches = {}
+    
+    def add(self, person_id, name, age, phone, grade, student_class):
+        """Add a student and return its view"""
+        row = self._add_person(person_id, name, age, phone)
+        self._grade_levels.append(grade)
+        self._class_codes.append(self.encode(student_class))
+        self._grade_totals.append(0)
+        Student.total_students += 1
+        return StudentView(self, row)
+
+
+class TeacherView(Teacher):
+    """Teacher backed by a row of a TeacherStore"""
+    
+    __slots__ = ("_store", "_row")
+    
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+    
+    _person_id = _column("_ids")
+    _name = _column("_names")
+    _age = _column("_ages")
+    _phone = _column("_phones")
+    _name_listeners = _listener_column("_name_listener_codes")
+    _change_listeners = _listener_column("_change_listener_codes")
+    _subject = _coded_column("_subject_codes")
+    _salary = _column("_salaries")
+    _classes = _sparse_column("_classes", ())
+
+
+class TeacherStore(PersonStore):
+    """Columnar storage for teachers"""
+    
+    _view_class = TeacherView
+    
+    def __init__(self):
+        super().__init__()
+        self._subject_codes = array("I")
+        self._salaries = array("d")
+        self._classes = {}
+    
+    def add(self, person_id, name, age, phone, subject, salary):
+        """Add a teacher and return its view"""
+        row = self._add_person(person_id, name, age, phone)
+        self._subject_codes.append(self.encode(subject))
+        self._salaries.append(salary)
+        Teacher.total_teachers += 1
+        return TeacherView(self, row)
+    
+    def salary_columns(self):
+        """(salaries, subject codes, subject names by code) without building views"""
+        return self._salaries, self._subject_codes, list(self._strings)
+
+
+# SORTED LIST CLASS
+# Demonstrates: Encapsulation - the bucket layout is private to this class
+
+
+class _SortedList:
+    """Sorted list stored as short sorted buckets
+    
+    A plain list pays a memmove of the whole tail on every insert; here an
+    insert or delete only shifts one bucket, so both stay cheap at a million
+    entries. Positions are bisect within a bucket plus the lengths before it,
+    read from a Fenwick tree over the bucket lengths in O(log buckets).
+    """
+    
+    _LOAD = 500
+    
+    def __init__(self):
+        self._buckets = []
+        self._maxes = []  # last item of each bucket
+        self._len = 0
+        # Fenwick tree of bucket lengths; None after buckets split or vanish,
+        # rebuilt on the next position query
+        self._tree = None
+    
+    def __len__(self):
+        return self._len
+    
+    def __iter__(self):
+        return chain.from_iterable(self._buckets)
+    
+    def add(self, item):
+        buckets, maxes = self._buckets, self._maxes
+        self._len += 1
+        if not buckets:
+            buckets.append([item])
+            maxes.append(item)
+            self._tree = None
+            return
+        index = bisect_left(maxes, item)
+        if index == len(maxes):
+            index -= 1
+            bucket = buckets[index]
+            bucket.append(item)
+            maxes[index] = item
+        else:
+            bucket = buckets[index]
+            insort(bucket, item)
+        if len(bucket) > 2 * self._LOAD:
+            buckets.insert(index + 1, bucket[self._LOAD:])
+            del bucket[self._LOAD:]
+            maxes[index] = bucket[-1]
+            maxes.insert(index + 1, buckets[index + 1][-1])
+            self._tree = None
+        else:
+            self._update(index, 1)
+    
+    def remove(self, item):
+        """Remove an item known to be present"""
+        index = bisect_left(self._maxes, item)
+        bucket = self._buckets[index]
+        del bucket[bisect_left(bucket, item)]
+        self._len -= 1
+        if not bucket:
+            del self._buckets[index]
+            del self._maxes[index]
+            self._tree = None
+        else:
+            self._maxes[index] = bucket[-1]
+            self._update(index, -1)
+    
+    def _update(self, index, delta):
+        tree = self._tree
+        if tree is not None:
+            while index < len(tree):
+                tree[index] += delta
+                index |= index + 1
+    
+    def _count_before(self, index):
+        """Number of items in buckets[:index]"""
+        tree = self._tree
+        if tree is None:
+            tree = self._tree = [len(bucket) for bucket in self._buckets]
+            for i in range(len(tree)):
+                parent = i | (i + 1)
+                if parent < len(tree):
+                    tree[parent] += tree[i]
+        total = 0
+        while index > 0:
+            total += tree[index - 1]
+            index &= index - 1
+        return total
+    
+    def bisect_left(self, item):
+        """Number of items less than item"""
+        index = bisect_left(self._maxes, item)
+        if index == len(self._maxes):
+            return self._len
+        return self._count_before(index) + bisect_left(self._buckets[index], item)
+    
+    def iter_from(self, item):
+        """Items greater than or equal to item, in order"""
+        index = bisect_left(self._maxes, item)
+        if index == len(self._maxes):
+            return iter(())
+        bucket = self._buckets[index]
+        return chain(islice(bucket, bisect_left(bucket, item), None),
+                     chain.from_iterable(islice(self._buckets, index + 1, None)))
+    
+    def head(self, n):
+        return list(islice(self, n))
+
+
 # STUDENT MANAGER CLASS
 # Demonstrates: Single Responsibility Principle (SRP)
 
@@ -220,15 +699,47 @@ class StudentManager:
     
     def __init__(self):
         self._students = {}
+        # Secondary indexes, kept in step with _students
+        self._by_class = {}
+        self._by_grade_level = {}
+        self._names = _SortedList()  # (casefolded name, id) pairs
     
     def add_student(self, student):
         """Add a new student to the system"""
         student_id = student.get_id()
         if student_id not in self._students:
             self._students[student_id] = student
+            self._by_class.setdefault(student.get_class(), {})[student_id] = student
+            self._by_grade_level.setdefault(student.get_grade_level(), {})[student_id] = student
+            self._names.add((student.get_name().casefold(), student_id))
+            student.add_name_listener(self._on_rename)
             return True
         return False
     
+    def _on_rename(self, student, old_name):
+        """Move a renamed student within the sorted name index"""
+        student_id = student.get_id()
+        self._names.remove((old_name.casefold(), student_id))
+        self._names.add((student.get_name().casefold(), student_id))
+    
+    def get_students_by_class(self, student_class):
+        """Get all students in a class"""
+        return list(self._by_class.get(student_class, {}).values())
+    
+    def get_students_by_grade_level(self, grade_level):
+        """Get all students in a grade level"""
+        return list(self._by_grade_level.get(grade_level, {}).values())
+    
+    def search_by_name_prefix(self, prefix):
+        """Get students whose name starts with prefix (case-insensitive), sorted by name"""
+        prefix = prefix.casefold()
+        results = []
+        for name, student_id in self._names.iter_from((prefix, "")):
+            if not name.startswith(prefix):
+                break
+            results.append(self._students[student_id])
+        return results
+    
     def get_student(self, student_id):
         """Get a student by ID"""
         return self._students.get(student_id)
@@ -275,9 +786,23 @@ class TeacherManager:
 # GRADE CALCULATOR CLASS
 # Demonstrates: Open/Closed Principle (OCP)
 
+def _bin(values, thresholds, labels):
+    """Map each value to labels[i], where i counts the thresholds it reaches"""
+    values = list(values)  # np.asarray would wrap a generator as one object
+    if np is not None:
+        index = np.searchsorted(np.asarray(thresholds), np.asarray(values, dtype=float), side="right")
+        return np.asarray(labels)[index].tolist()
+    return [labels[bisect_right(thresholds, value)] for value in values]
+
+
 class GradeCalculator:
     """Base calculator - Open for extension, closed for modification"""
     
+    # Band lower bounds (ascending) and what each band maps to
+    GRADE_THRESHOLDS = (60, 70, 80, 90)
+    LETTERS = ("F", "D", "C", "B", "A")
+    GPA_POINTS = (0.0, 1.0, 2.0, 3.0, 4.0)
+    
     def calculate_letter_grade(self, numeric_grade):
         """Convert numeric grade to letter grade"""
         if numeric_grade >= 90:
@@ -308,6 +833,34 @@ class GradeCalculator:
                 total += 1.0
         
         return total / len(grades_dict)
+    
+    # Batch methods - one call for many students
+    def calculate_letter_grades(self, averages):
+        """Convert a sequence of numeric grades to letter grades"""
+        return _bin(averages, self.GRADE_THRESHOLDS, self.LETTERS)
+    
+    def calculate_gpas(self, grade_lists):
+        """Calculate one GPA per iterable of grades (0.0 for an empty one)"""
+        counts = []
+        flat = []
+        for grades in grade_lists:
+            before = len(flat)
+            flat.extend(grades)
+            counts.append(len(flat) - before)
+        if np is not None:
+            counts = np.asarray(counts, dtype=np.intp)
+            points = np.asarray(self.GPA_POINTS)[
+                np.searchsorted(np.asarray(self.GRADE_THRESHOLDS), np.asarray(flat, dtype=float), side="right")]
+            owners = np.repeat(np.arange(len(counts)), counts)
+            totals = np.bincount(owners, weights=points, minlength=len(counts))
+            return np.divide(totals, counts, out=np.zeros(len(counts)), where=counts > 0).tolist()
+        points = _bin(flat, self.GRADE_THRESHOLDS, self.GPA_POINTS)
+        gpas = []
+        start = 0
+        for count in counts:
+            gpas.append(sum(points[start:start + count]) / count if count else 0.0)
+            start += count
+        return gpas
 
 
 # ADVANCED GRADE CALCULATOR CLASS
@@ -316,6 +869,9 @@ class GradeCalculator:
 class AdvancedGradeCalculator(GradeCalculator):
     """Extended calculator - adds features without modifying base class"""
     
+    STATUS_THRESHOLDS = (60, 70, 85)
+    STATUSES = ("Fail", "Pass", "Good", "Excellent")
+    
     def get_grade_status(self, average):
         """Get status based on average grade"""
         if average >= 85:
@@ -326,6 +882,329 @@ class AdvancedGradeCalculator(GradeCalculator):
             return "Pass"
         else:
             return "Fail"
+    
+    def get_grade_statuses(self, averages):
+        """Get status for a sequence of average grades"""
+        return _bin(averages, self.STATUS_THRESHOLDS, self.STATUSES)
+
+
+# GRADE STATISTICS CLASS
+# Demonstrates: Single Responsibility Principle (SRP) - students only announce
+# grade changes; the aggregates live here
+
+
+class GradeDistribution:
+    """Running count, mean, variance and a fixed-resolution quantile sketch of grades
+    
+    Every update is O(1) and can be undone, so changing a grade just swaps
+    the old value for the new one. Quantiles are exact to within half of
+    `resolution` (grades are bounded to 0-100).
+    """
+    
+    __slots__ = ("resolution", "count", "mean", "_m2", "_buckets")
+    
+    def __init__(self, resolution=1.0):
+        self.resolution = resolution
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # sum of squared deviations (Welford)
+        self._buckets = array("L", bytes(array("L").itemsize * (int(100 / resolution) + 1)))
+    
+    def add(self, grade):
+        self.count += 1
+        delta = grade - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (grade - self.mean)
+        self._buckets[round(grade / self.resolution)] += 1
+    
+    def remove(self, grade):
+        self.count -= 1
+        if self.count == 0:
+            self.mean = self._m2 = 0.0
+        else:
+            delta = grade - self.mean
+            self.mean -= delta / self.count
+            self._m2 = max(0.0, self._m2 - delta * (grade - self.mean))
+        self._buckets[round(grade / self.resolution)] -= 1
+    
+    def variance(self):
+        """Population variance"""
+        return self._m2 / self.count if self.count else 0.0
+    
+    def stddev(self):
+        return self.variance() ** 0.5
+    
+    def quantile(self, q):
+        """Smallest grade with at least a fraction q of grades at or below it"""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for index, bucket in enumerate(self._buckets):
+            seen += bucket
+            if seen >= rank:
+                return index * self.resolution
+        return 100.0
+    
+    def histogram(self, bin_width=10):
+        """{lower bound: count} in bins of bin_width; the last bin includes 100"""
+        bins = dict.fromkeys(range(0, 100, bin_width), 0)
+        for index, bucket in enumerate(self._buckets):
+            if bucket:
+                bins[min(int(index * self.resolution // bin_width) * bin_width, 100 - bin_width)] += bucket
+        return bins
+    
+    def summary(self, quantiles=(0.25, 0.5, 0.75, 0.9)):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "stddev": self.stddev(),
+            "quantiles": {q: self.quantile(q) for q in quantiles},
+            "histogram": self.histogram(),
+        }
+
+
+class GradeStatistics:
+    """Grade distributions school-wide, per class and per subject, kept current as grades change"""
+    
+    def __init__(self, resolution=1.0):
+        self._resolution = resolution
+        self.overall = GradeDistribution(resolution)
+        self._by_class = {}
+        self._by_subject = {}
+    
+    def add_student(self, student):
+        """Count the student's current grades and follow their changes"""
+        student_class = student.get_class()
+        for subject, grade in student.get_grades().items():
+            self._add(student_class, subject, grade)
+        student.add_change_listener(self._on_student_change)
+    
+    def _on_student_change(self, student, change, value):
+        if change == "grade":
+            subject, grade, old_grade = value
+            student_class = student.get_class()
+            if old_grade is not None:
+                self._distributions(student_class, subject, GradeDistribution.remove, old_grade)
+            self._add(student_class, subject, grade)
+    
+    def _add(self, student_class, subject, grade):
+        self._distributions(student_class, subject, GradeDistribution.add, grade)
+    
+    def _distributions(self, student_class, subject, update, grade):
+        for distributions, key in ((self._by_class, student_class), (self._by_subject, subject)):
+            distribution = distributions.get(key)
+            if distribution is None:
+                distribution = distributions[key] = GradeDistribution(self._resolution)
+            update(distribution, grade)
+        update(self.overall, grade)
+    
+    def for_class(self, student_class):
+        """Distribution of every grade in a class (None if it has none)"""
+        return self._by_class.get(student_class)
+    
+    def for_subject(self, subject):
+        """Distribution of every grade in a subject (None if it has none)"""
+        return self._by_subject.get(subject)
+    
+    def classes(self):
+        return sorted(self._by_class)
+    
+    def subjects(self):
+        return sorted(self._by_subject)
+    
+    def summary(self):
+        """Nested dict of every distribution's summary, ready for a dashboard or JSON"""
+        return {
+            "overall": self.overall.summary(),
+            "by_class": {key: self._by_class[key].summary() for key in self.classes()},
+            "by_subject": {key: self._by_subject[key].summary() for key in self.subjects()},
+        }
+
+
+# STUDENT RANKINGS CLASS
+# Demonstrates: Single Responsibility Principle (SRP) - ordering lives
+# outside the student and manager classes
+
+
+class StudentRankings:
+    """Students ordered by average grade, school-wide and per class
+    
+    Each ranking holds (-average, student_id), so the best student comes
+    first and ties are broken by id. A grade change moves the student with
+    one delete and one insert; rank and percentile queries are bisects.
+    Students enter the rankings with their first grade.
+    """
+    
+    def __init__(self):
+        self._overall = _SortedList()
+        self._by_class = {}
+        self._keys = {}  # student_id -> current sort key
+        self._students = {}
+    
+    def add_student(self, student):
+        """Rank the student (once graded) and follow its grade changes"""
+        self._students[student.get_id()] = student
+        if student.get_grades():
+            self._place(student)
+        student.add_change_listener(self._on_student_change)
+    
+    def _on_student_change(self, student, change, value):
+        if change == "grade":
+            self._place(student)
+    
+    def _place(self, student):
+        student_id = student.get_id()
+        key = (-student.calculate_average(), student_id)
+        old_key = self._keys.get(student_id)
+        if old_key == key:
+            return
+        student_class = student.get_class()
+        class_ranking = self._by_class.get(student_class)
+        if class_ranking is None:
+            class_ranking = self._by_class[student_class] = _SortedList()
+        for ranking in (self._overall, class_ranking):
+            if old_key is not None:
+                ranking.remove(old_key)
+            ranking.add(key)
+        self._keys[student_id] = key
+    
+    def _ranking(self, student_class):
+        if student_class is None:
+            return self._overall
+        return self._by_class.get(student_class, _SortedList())
+    
+    def top(self, n, student_class=None):
+        """[(student, average)] for the n best students, best first"""
+        return [(self._students[student_id], -negative)
+                for negative, student_id in self._ranking(student_class).head(n)]
+    
+    def rank(self, student_id, student_class=None):
+        """1-based rank (tied averages share a rank), or None if the student is not ranked"""
+        key = self._keys.get(student_id)
+        if key is None or (student_class is not None
+                           and self._students[student_id].get_class() != student_class):
+            return None
+        # (score,) sorts before every (score, id), so this counts strictly better averages
+        return self._ranking(student_class).bisect_left((key[0],)) + 1
+    
+    def percentile(self, student_id, student_class=None):
+        """Percentile rank: % of ranked students below, counting ties as half, or None"""
+        rank = self.rank(student_id, student_class)
+        if rank is None:
+            return None
+        ranking = self._ranking(student_class)
+        not_below = ranking.bisect_left((math.nextafter(self._keys[student_id][0], math.inf),))
+        ties = not_below - (rank - 1)
+        return 100.0 * (len(ranking) - not_below + 0.5 * ties) / len(ranking)
+    
+    def count(self, student_class=None):
+        """Number of ranked students"""
+        return len(self._ranking(student_class))
+
+
+# PAYROLL ENGINE CLASS
+# Demonstrates: Open/Closed Principle (OCP) - a new tax rule is a new bracket
+# table, not a new method
+
+
+class PayrollEngine:
+    """Tax, net pay and rollups for every teacher in one vectorized pass"""
+    
+    # (lower bound, rate) per band, ascending from 0. By default the whole
+    # salary is taxed at its band's rate, the same rule as Teacher.calculate_tax;
+    # progressive=True taxes each slice at its own band's rate instead.
+    # Validation and band labels come from school_db, so the SQL payroll and
+    # this engine accept the same tables and name bands the same way
+    DEFAULT_BRACKETS = school_db.PAYROLL_BRACKETS
+    
+    def __init__(self, brackets=DEFAULT_BRACKETS, progressive=False):
+        bounds, rates = school_db.check_brackets(brackets)
+        self.progressive = progressive
+        self._bounds = bounds
+        self._rates = rates
+        # Tax owed on everything below each bound (progressive only)
+        self._base = [0.0]
+        for (low, rate), high in zip(zip(bounds, rates), bounds[1:]):
+            self._base.append(self._base[-1] + (high - low) * rate)
+    
+    def band_labels(self):
+        return school_db.band_labels(zip(self._bounds, self._rates))
+    
+    def calculate(self, salaries):
+        """(band index, tax) per salary, as NumPy arrays when NumPy is available"""
+        thresholds = self._bounds[1:]
+        if np is not None:
+            salaries = np.asarray(salaries, dtype=float)
+            bands = np.searchsorted(np.asarray(thresholds), salaries, side="right")
+            rates = np.asarray(self._rates)[bands]
+            if self.progressive:
+                taxes = np.asarray(self._base)[bands] + (salaries - np.asarray(self._bounds)[bands]) * rates
+            else:
+                taxes = salaries * rates
+            return bands, taxes
+        bands = [bisect_right(thresholds, salary) for salary in salaries]
+        if self.progressive:
+            taxes = [self._base[band] + (salary - self._bounds[band]) * self._rates[band]
+                     for salary, band in zip(salaries, bands)]
+        else:
+            taxes = [salary * self._rates[band] for salary, band in zip(salaries, bands)]
+        return bands, taxes
+    
+    def calculate_taxes(self, salaries):
+        """Tax for each salary, as Python floats"""
+        taxes = self.calculate(salaries)[1]
+        return taxes.tolist() if np is not None else list(taxes)
+    
+    def run(self, teachers):
+        """Totals, per-subject and per-band rollups for teachers (or a TeacherStore)"""
+        if isinstance(teachers, TeacherStore):
+            salaries, subject_codes, subjects = teachers.salary_columns()
+        else:
+            codes = {}
+            salaries = [teacher.get_salary() for teacher in teachers]
+            subject_codes = [codes.setdefault(teacher.get_subject(), len(codes)) for teacher in teachers]
+            subjects = list(codes)
+        bands, taxes = self.calculate(salaries)
+        labels = self.band_labels()
+        if np is not None:
+            salaries = np.asarray(salaries, dtype=float)
+            subject_codes = np.asarray(subject_codes, dtype=np.intp)
+            by_subject = self._rollup(subject_codes, len(subjects), salaries, taxes)
+            by_band = self._rollup(bands, len(labels), salaries, taxes)
+            gross, tax = float(salaries.sum()), float(taxes.sum())
+        else:
+            by_subject = self._rollup_loop(subject_codes, len(subjects), salaries, taxes)
+            by_band = self._rollup_loop(bands, len(labels), salaries, taxes)
+            gross, tax = float(sum(salaries)), float(sum(taxes))
+        return {
+            "teachers": len(salaries),
+            "gross": gross,
+            "tax": tax,
+            "net": gross - tax,
+            "by_subject": {subject: row for subject, row in sorted(zip(subjects, by_subject))
+                           if row["teachers"]},
+            "by_band": dict(zip(labels, by_band)),
+        }
+    
+    @staticmethod
+    def _rollup(groups, size, salaries, taxes):
+        counts = np.bincount(groups, minlength=size)
+        gross = np.bincount(groups, weights=salaries, minlength=size)
+        tax = np.bincount(groups, weights=taxes, minlength=size)
+        return [{"teachers": int(c), "gross": float(g), "tax": float(t), "net": float(g - t)}
+                for c, g, t in zip(counts, gross, tax)]
+    
+    @staticmethod
+    def _rollup_loop(groups, size, salaries, taxes):
+        rows = [{"teachers": 0, "gross": 0.0, "tax": 0.0, "net": 0.0} for _ in range(size)]
+        for group, salary, tax in zip(groups, salaries, taxes):
+            row = rows[group]
+            row["teachers"] += 1
+            row["gross"] += salary
+            row["tax"] += tax
+            row["net"] += salary - tax
+        return rows
 
 
 # NOTIFIABLE INTERFACE
@@ -365,6 +1244,130 @@ class SMSNotification(Notifiable):
         return True
 
 
+# ASYNC NOTIFICATION DISPATCHER CLASS
+# Demonstrates: Liskov Substitution Principle (LSP) - a drop-in Notifiable
+
+
+class AsyncNotificationDispatcher(Notifiable):
+    """Queues notifications and delivers them in batches on a background event loop"""
+    
+    def __init__(self, sender=None, batch_size=50, max_concurrency=10, max_retries=3, backoff=0.05):
+        # sender: anything with an async send_async(message) or a Notifiable
+        self._sender = sender if sender is not None else EmailNotification()
+        self._batch_size = batch_size
+        self._max_concurrency = max_concurrency
+        self._max_retries = max_retries
+        self._backoff = backoff
+        self._stats = {"queued": 0, "sent": 0, "failed": 0, "retries": 0, "batches": 0}
+        self._send_seconds = 0.0
+        self._stats_lock = threading.Lock()
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run_loop, name="notifier", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+    
+    def send_notification(self, message):
+        """Queue message for delivery; returns immediately"""
+        self._count("queued")
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+        return True
+    
+    def flush(self, timeout=None):
+        """Block until every queued message has been delivered or given up on"""
+        asyncio.run_coroutine_threadsafe(self._queue.join(), self._loop).result(timeout)
+    
+    def close(self):
+        """Flush, then stop the background loop"""
+        self.flush()
+        asyncio.run_coroutine_threadsafe(self._stop_consumer(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def get_stats(self):
+        """Delivery counters plus mean send latency in milliseconds"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+            attempts = stats["sent"] + stats["failed"] + stats["retries"]
+            stats["mean_send_ms"] = self._send_seconds / attempts * 1000 if attempts else 0.0
+        return stats
+    
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        # batches in flight; a batch waiting out retry backoff keeps its slot
+        # but not a send slot, so later batches go out meanwhile
+        self._batch_slots = asyncio.Semaphore(self._max_concurrency)
+        self._batches = set()
+        self._consumer = self._loop.create_task(self._consume())
+        self._ready.set()
+        self._loop.run_forever()
+    
+    async def _stop_consumer(self):
+        self._consumer.cancel()
+        try:
+            await self._consumer
+        except asyncio.CancelledError:
+            pass
+    
+    async def _consume(self):
+        while True:
+            await self._batch_slots.acquire()
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._count("batches")
+            task = self._loop.create_task(self._deliver_batch(batch))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+    
+    async def _deliver_batch(self, batch):
+        try:
+            await asyncio.gather(*(self._deliver(message) for message in batch))
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+            self._batch_slots.release()
+    
+    async def _deliver(self, message):
+        for attempt in range(self._max_retries + 1):
+            async with self._semaphore:
+                started = time.perf_counter()
+                try:
+                    delivered = await self._send(message)
+                except Exception:
+                    delivered = False
+                with self._stats_lock:
+                    self._send_seconds += time.perf_counter() - started
+            if delivered:
+                self._count("sent")
+                return True
+            if attempt < self._max_retries:
+                self._count("retries")
+                await asyncio.sleep(self._backoff * 2 ** attempt)
+        self._count("failed")
+        return False
+    
+    async def _send(self, message):
+        send_async = getattr(self._sender, "send_async", None)
+        if send_async is not None:
+            return await send_async(message)
+        # Blocking Notifiable: run it off the event loop
+        return await asyncio.to_thread(self._sender.send_notification, message)
+
+
 # REPORT GENERATOR CLASS
 # Demonstrates: Dependency Inversion Principle (DIP)
 
@@ -375,27 +1378,491 @@ class ReportGenerator:
         """Inject notification dependency"""
         self._notifier = notifier
     
+    _BANNER = "=" * 50
+    _REPORT_FORMAT = (_BANNER + "\nSTUDENT REPORT\n" + _BANNER + "\n{}\n" + _BANNER).format
+    
     def generate_student_report(self, student):
         """Generate a student report"""
-        report = "=" * 50 + "\n"
-        report += "STUDENT REPORT\n"
-        report += "=" * 50 + "\n"
-        report += student.display_info()
-        report += "\n" + "=" * 50
-        return report
+        return self._REPORT_FORMAT(student.display_info())
     
     def send_report(self, report):
         """Send report using injected notifier"""
         return self._notifier.send_notification(report)
 
 
+# REPORT RENDERER CLASS
+# Demonstrates: Open/Closed Principle (OCP) - new formats are new entries
+
+
+class ReportRenderer:
+    """Writes student/teacher reports straight to a file-like sink in text, CSV or JSON"""
+    
+    FORMATS = ("text", "csv", "json")
+    STUDENT_FIELDS = ("id", "name", "age", "phone", "grade", "class", "average")
+    TEACHER_FIELDS = ("id", "name", "age", "phone", "subject", "salary", "classes")
+    
+    # Banners and the role's info layout in one template, so a text report is
+    # formatted once, straight from the fields, and written in one call
+    _TEXT_FORMATS = {
+        role: (ReportGenerator._BANNER + f"\n{role.upper()} REPORT\n" + ReportGenerator._BANNER + "\n"
+               + cls._INFO_TEMPLATE + "\n" + ReportGenerator._BANNER + "\n\n").format
+        for role, cls in (("Student", Student), ("Teacher", Teacher))
+    }
+    
+    def __init__(self, output_format="text"):
+        if output_format not in self.FORMATS:
+            raise ValueError(f"Unknown format {output_format!r}, expected one of {self.FORMATS}")
+        self._format = output_format
+        self._encode_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    
+    @staticmethod
+    def _student_values(student):
+        return (student.get_id(), student.get_name(), student.get_age(), student.get_phone(),
+                student.get_grade_level(), student.get_class(), round(student.calculate_average(), 2))
+    
+    @staticmethod
+    def _teacher_values(teacher):
+        return (teacher.get_id(), teacher.get_name(), teacher.get_age(), teacher.get_phone(),
+                teacher.get_subject(), teacher.get_salary(), ";".join(teacher.get_classes()))
+    
+    def write_header(self, role, sink):
+        """Write the CSV header row for role ("Student"/"Teacher"); no-op for other formats"""
+        if self._format == "csv":
+            fields = self.STUDENT_FIELDS if role == "Student" else self.TEACHER_FIELDS
+            csv.writer(sink).writerow(fields)
+    
+    def render(self, person, sink, writer=None):
+        """Write one report for a Student or Teacher to sink"""
+        role = person.get_role()
+        if self._format == "text":
+            sink.write(self._TEXT_FORMATS[role](*person._info_fields()))
+            return
+        is_student = role == "Student"
+        values = self._student_values(person) if is_student else self._teacher_values(person)
+        if self._format == "csv":
+            (writer or csv.writer(sink)).writerow(values)
+        else:
+            fields = self.STUDENT_FIELDS if is_student else self.TEACHER_FIELDS
+            sink.write(self._encode_json(dict(zip(fields, values))))
+            sink.write("\n")
+    
+    def render_all(self, people, sink, header=True):
+        """Write reports for many people of one role; returns how many were written"""
+        count = 0
+        writer = csv.writer(sink) if self._format == "csv" else None
+        for person in people:
+            if count == 0 and header:
+                self.write_header(person.get_role(), sink)
+            self.render(person, sink, writer)
+            count += 1
+        return count
+
+
+def _student_report_row(student):
+    """Plain, picklable data needed to rebuild a student in a worker (report_worker.py)"""
+    return (student.get_id(), student.get_name(), student.get_age(), student.get_phone(),
+            student.get_grade_level(), student.get_class(), student.get_grades())
+
+
+# SCHOOL REPOSITORY CLASS
+# Demonstrates: Single Responsibility Principle (SRP) - persistence lives
+# outside the model classes
+
+
+class RepositoryConflictError(Exception):
+    """New students or teachers whose ids are already taken in the database"""
+    
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        ids = ", ".join(f"{kind} {person_id}" for kind, person_id in conflicts)
+        super().__init__(f"already in the database: {ids}")
+
+
+class SchoolRepository:
+    """Keeps students and teachers in SQLite, with an identity map and write-behind unit of work
+    
+    Changes are written when flush_threshold of them are pending or, on the next
+    change, once the oldest is max_delay seconds old. Call save()/flush() or close()
+    to write the rest; anything still pending at interpreter exit is flushed then.
+    """
+    
+    # One statement per kind of pending change
+    _SQL = {
+        "student": school_db.INSERT_STUDENT,
+        "teacher": school_db.INSERT_TEACHER,
+        "student_name": "update students set name = ? where id = ?",
+        "teacher_name": "update teachers set name = ? where id = ?",
+        "student_phone": "update students set phone = ? where id = ?",
+        "teacher_phone": "update teachers set phone = ? where id = ?",
+        "salary": "update teachers set salary = ? where id = ?",
+        "grade": school_db.UPSERT_GRADE,
+        "class": "insert or ignore into teacher_classes (teacher_id, class_name) values (?, ?)",
+    }
+    
+    def __init__(self, path, flush_threshold=500, max_delay=2.0):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("pragma journal_mode=WAL")
+        # Same tables and triggers as the GUI and the API use
+        school_db.create_schema(self._conn)
+        self._flush_threshold = flush_threshold
+        self._max_delay = max_delay
+        # Identity map: at most one object per id
+        self._students = {}
+        self._teachers = {}
+        # Unit of work: (kind, key) -> params; later edits to the same field replace earlier ones
+        self._pending = {}
+        self._pending_since = None
+        # Set while a flush is blocked by a conflict; only save()/flush() retry then
+        self._conflict = None
+        atexit.register(self.flush)
+    
+    # Loading
+    def get_student(self, student_id):
+        """Get a student by ID, loading it on first use"""
+        student = self._students.get(student_id)
+        if student is None:
+            row = self._conn.execute("select * from students where id = ?", (student_id,)).fetchone()
+            if row is None:
+                return None
+            grades = self._conn.execute("select subject, grade from grades where student_id = ?",
+                                        (student_id,)).fetchall()
+            student = self._hydrate_student(row, grades)
+        return student
+    
+    def get_teacher(self, teacher_id):
+        """Get a teacher by ID, loading it on first use"""
+        teacher = self._teachers.get(teacher_id)
+        if teacher is None:
+            row = self._conn.execute("select * from teachers where id = ?", (teacher_id,)).fetchone()
+            if row is None:
+                return None
+            classes = self._conn.execute("select class_name from teacher_classes where teacher_id = ?",
+                                         (teacher_id,)).fetchall()
+            teacher = self._hydrate_teacher(row, [name for (name,) in classes])
+        return teacher
+    
+    @metrics.instrument("repository.load_all_students", rows=len)
+    def load_all_students(self):
+        """Load every student with two queries; objects already in the identity map are reused"""
+        grades = {}
+        for student_id, subject, grade in self._conn.execute("select student_id, subject, grade from grades"):
+            grades.setdefault(student_id, []).append((subject, grade))
+        students = []
+        for row in self._conn.execute("select * from students order by id"):
+            student = self._students.get(row[0])
+            if student is None:
+                student = self._hydrate_student(row, grades.get(row[0], ()))
+            students.append(student)
+        return students
+    
+    @metrics.instrument("repository.load_all_teachers", rows=len)
+    def load_all_teachers(self):
+        """Load every teacher with two queries; objects already in the identity map are reused"""
+        classes = {}
+        for teacher_id, class_name in self._conn.execute("select teacher_id, class_name from teacher_classes"):
+            classes.setdefault(teacher_id, []).append(class_name)
+        teachers = []
+        for row in self._conn.execute("select * from teachers order by id"):
+            teacher = self._teachers.get(row[0])
+            if teacher is None:
+                teacher = self._hydrate_teacher(row, classes.get(row[0], ()))
+            teachers.append(teacher)
+        return teachers
+    
+    def _hydrate_student(self, row, grades):
+        student = Student(*row)
+        for subject, grade in grades:
+            student.add_grade(subject, grade)
+        # Track only after loading, so loaded state is not written back
+        student.add_change_listener(self._on_student_change)
+        self._students[student.get_id()] = student
+        return student
+    
+    def _hydrate_teacher(self, row, classes):
+        teacher = Teacher(*row)
+        for class_name in classes:
+            teacher.add_class(class_name)
+        teacher.add_change_listener(self._on_teacher_change)
+        self._teachers[teacher.get_id()] = teacher
+        return teacher
+    
+    # Saving
+    def add_student(self, student):
+        """Start tracking a new student; it is inserted on the next flush"""
+        student_id = student.get_id()
+        if student_id in self._students or self._exists("students", student_id):
+            return False
+        self._students[student_id] = student
+        self._record(("student", student_id), (student_id, student.get_name(), student.get_age(),
+                                               student.get_phone(), student.get_grade_level(),
+                                               student.get_class()))
+        for subject, grade in student.get_grades().items():
+            self._record(("grade", student_id, subject), (student_id, subject, grade))
+        student.add_change_listener(self._on_student_change)
+        return True
+    
+    def add_teacher(self, teacher):
+        """Start tracking a new teacher; it is inserted on the next flush"""
+        teacher_id = teacher.get_id()
+        if teacher_id in self._teachers or self._exists("teachers", teacher_id):
+            return False
+        self._teachers[teacher_id] = teacher
+        self._record(("teacher", teacher_id), (teacher_id, teacher.get_name(), teacher.get_age(),
+                                               teacher.get_phone(), teacher.get_subject(),
+                                               teacher.get_salary()))
+        for class_name in teacher.get_classes():
+            self._record(("class", teacher_id, class_name), (teacher_id, class_name))
+        teacher.add_change_listener(self._on_teacher_change)
+        return True
+    
+    def _exists(self, table, person_id):
+        return self._conn.execute(f"select 1 from {table} where id = ?", (person_id,)).fetchone() is not None
+    
+    def _on_student_change(self, student, change, value):
+        student_id = student.get_id()
+        if change == "grade":
+            subject, grade, _ = value
+            self._record(("grade", student_id, subject), (student_id, subject, grade))
+        elif change in ("name", "phone"):
+            self._record(("student_" + change, student_id), (value, student_id))
+    
+    def _on_teacher_change(self, teacher, change, value):
+        teacher_id = teacher.get_id()
+        if change == "class":
+            self._record(("class", teacher_id, value), (teacher_id, value))
+        elif change == "salary":
+            self._record(("salary", teacher_id), (value, teacher_id))
+        elif change in ("name", "phone"):
+            self._record(("teacher_" + change, teacher_id), (value, teacher_id))
+    
+    def _record(self, key, params):
+        self._pending[key] = params
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        if self._conflict is None and (len(self._pending) >= self._flush_threshold
+                                       or time.monotonic() - self._pending_since >= self._max_delay):
+            try:
+                self.flush()
+            except RepositoryConflictError:
+                pass  # kept pending; the next save() raises it to the caller
+    
+    def pending_count(self):
+        """Number of changes waiting to be written"""
+        return len(self._pending)
+    
+    @metrics.instrument("repository.flush", rows=lambda written: written)
+    def flush(self):
+        """Write all pending changes in one transaction; returns how many were written
+        
+        Raises RepositoryConflictError, writing nothing, when a new student or teacher
+        id was inserted by someone else since it was added here.
+        """
+        if not self._pending:
+            return 0
+        by_kind = {}
+        for key, params in self._pending.items():
+            by_kind.setdefault(key[0], []).append(params)
+        try:
+            with self._conn:
+                # New rows first so the updates that follow find them
+                for kind in ("student", "teacher"):
+                    if kind in by_kind:
+                        self._conn.executemany(self._SQL[kind], by_kind.pop(kind))
+                for kind, rows in by_kind.items():
+                    self._conn.executemany(self._SQL[kind], rows)
+        except sqlite3.IntegrityError:
+            conflicts = [key for key in self._pending
+                         if key[0] in ("student", "teacher") and self._exists(key[0] + "s", key[1])]
+            if not conflicts:
+                raise
+            self._conflict = RepositoryConflictError(conflicts)
+            raise self._conflict
+        written = len(self._pending)
+        self._pending = {}
+        self._pending_since = None
+        self._conflict = None
+        return written
+    
+    def discard(self):
+        """Drop pending changes without writing them, e.g. after a conflict"""
+        self._pending = {}
+        self._pending_since = None
+        self._conflict = None
+    
+    def close(self):
+        """Flush pending changes and close the connection"""
+        self.flush()
+        self._conn.close()
+        atexit.unregister(self.flush)
+
+
+# SCHOOL SNAPSHOT CLASS
+# Demonstrates: Encapsulation - the file format is private to this class
+
+
+class SchoolSnapshot:
+    """Compact binary snapshot of a school, read lazily through mmap
+    
+    Layout: header, school name, one record per person, then a table of
+    student record offsets sorted by ID (binary-searched on lookup) and a
+    table of teacher record offsets.
+    """
+    
+    MAGIC = b"SCHSNAP1"
+    _HEADER = struct.Struct("<8sIIQQ")  # magic, students, teachers, student index, teacher index
+    _LENGTH = struct.Struct("<I")
+    _INT = struct.Struct("<q")
+    _FLOAT = struct.Struct("<d")
+    
+    # Writing
+    @classmethod
+    def write(cls, path, school_name, students, teachers):
+        """Write students and teachers to path atomically; returns bytes written"""
+        temp_path = path + ".tmp"
+        student_offsets = []
+        teacher_offsets = []
+        with open(temp_path, "wb") as f:
+            f.write(b"\0" * cls._HEADER.size)
+            f.write(cls._pack_str(school_name))
+            for student in students:
+                student_offsets.append((student.get_id(), f.tell()))
+                f.write(cls._pack_student(student))
+            for teacher in teachers:
+                teacher_offsets.append(f.tell())
+                f.write(cls._pack_teacher(teacher))
+            student_offsets.sort()
+            student_index = f.tell()
+            f.write(array("Q", [offset for _, offset in student_offsets]).tobytes())
+            teacher_index = f.tell()
+            f.write(array("Q", teacher_offsets).tobytes())
+            size = f.tell()
+            f.seek(0)
+            f.write(cls._HEADER.pack(cls.MAGIC, len(student_offsets), len(teacher_offsets),
+                                     student_index, teacher_index))
+        os.replace(temp_path, path)
+        return size
+    
+    @classmethod
+    def _pack_str(cls, value):
+        data = value.encode("utf-8")
+        return cls._LENGTH.pack(len(data)) + data
+    
+    @classmethod
+    def _pack_number(cls, value):
+        # Tagged so ints come back as ints (display_info shows "$5000", not "$5000.0")
+        if isinstance(value, int):
+            return b"i" + cls._INT.pack(value)
+        return b"d" + cls._FLOAT.pack(value)
+    
+    @classmethod
+    def _pack_student(cls, student):
+        parts = [cls._pack_str(student.get_id()), cls._pack_str(student.get_name()),
+                 cls._pack_number(student.get_age()), cls._pack_str(student.get_phone()),
+                 cls._pack_number(student.get_grade_level()), cls._pack_str(student.get_class())]
+        grades = student.get_grades()
+        parts.append(cls._LENGTH.pack(len(grades)))
+        for subject, grade in grades.items():
+            parts.append(cls._pack_str(subject))
+            parts.append(cls._pack_number(grade))
+        return b"".join(parts)
+    
+    @classmethod
+    def _pack_teacher(cls, teacher):
+        parts = [cls._pack_str(teacher.get_id()), cls._pack_str(teacher.get_name()),
+                 cls._pack_number(teacher.get_age()), cls._pack_str(teacher.get_phone()),
+                 cls._pack_str(teacher.get_subject()), cls._pack_number(teacher.get_salary())]
+        classes = teacher.get_classes()
+        parts.append(cls._LENGTH.pack(len(classes)))
+        parts.extend(cls._pack_str(class_name) for class_name in classes)
+        return b"".join(parts)
+    
+    # Reading
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, students, teachers, student_index, teacher_index = self._HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC:
+            self._map.close()
+            raise ValueError(f"Not a school snapshot: {path}")
+        self.school_name, _ = self._read_str(self._HEADER.size)
+        # Offset tables are read in place, not copied
+        view = memoryview(self._map)
+        self._student_offsets = view[student_index:student_index + 8 * students].cast("Q")
+        self._teacher_offsets = view[teacher_index:teacher_index + 8 * teachers].cast("Q")
+        view.release()
+    
+    def student_count(self):
+        return len(self._student_offsets)
+    
+    def _read_str(self, offset):
+        (length,) = self._LENGTH.unpack_from(self._map, offset)
+        start = offset + 4
+        return self._map[start:start + length].decode("utf-8"), start + length
+    
+    def _read_number(self, offset):
+        codec = self._INT if self._map[offset:offset + 1] == b"i" else self._FLOAT
+        return codec.unpack_from(self._map, offset + 1)[0], offset + 9
+    
+    def find_student(self, student_id):
+        """Build the student with this ID, or None; O(log n) reads"""
+        index = bisect_left(self._student_offsets, student_id, key=lambda offset: self._read_str(offset)[0])
+        if index == len(self._student_offsets):
+            return None
+        offset = self._student_offsets[index]
+        if self._read_str(offset)[0] != student_id:
+            return None
+        return self._read_student(offset)
+    
+    def iter_students(self):
+        for offset in self._student_offsets:
+            yield self._read_student(offset)
+    
+    def iter_teachers(self):
+        for offset in self._teacher_offsets:
+            yield self._read_teacher(offset)
+    
+    def _read_student(self, offset):
+        fields = []
+        for reader in (self._read_str, self._read_str, self._read_number, self._read_str,
+                       self._read_number, self._read_str):
+            value, offset = reader(offset)
+            fields.append(value)
+        student = Student(*fields)
+        (count,) = self._LENGTH.unpack_from(self._map, offset)
+        offset += 4
+        for _ in range(count):
+            subject, offset = self._read_str(offset)
+            grade, offset = self._read_number(offset)
+            student.add_grade(subject, grade)
+        return student
+    
+    def _read_teacher(self, offset):
+        fields = []
+        for reader in (self._read_str, self._read_str, self._read_number, self._read_str,
+                       self._read_str, self._read_number):
+            value, offset = reader(offset)
+            fields.append(value)
+        teacher = Teacher(*fields)
+        (count,) = self._LENGTH.unpack_from(self._map, offset)
+        offset += 4
+        for _ in range(count):
+            class_name, offset = self._read_str(offset)
+            teacher.add_class(class_name)
+        return teacher
+    
+    def close(self):
+        self._student_offsets.release()
+        self._teacher_offsets.release()
+        self._map.close()
+
+
 # SCHOOL CLASS - Main System
 
 
 class School:
     """Main school management system"""
     
-    def __init__(self, school_name):
+    def __init__(self, school_name, notifier=None, repository=None):
         self._school_name = school_name
         
         # Use manager classes (SRP)
@@ -405,58 +1872,272 @@ class School:
         # Use calculator (OCP)
         self._grade_calc = AdvancedGradeCalculator()
         
+        # Grade aggregates, updated as students and grades are added (SRP)
+        self._statistics = GradeStatistics()
+        self._rankings = StudentRankings()
+        self._payroll = PayrollEngine()
+        
         # Use dependency injection (DIP)
-        notifier = EmailNotification()
+        if notifier is None:
+            notifier = EmailNotification()
         self._report_gen = ReportGenerator(notifier)
+        
+        # Optional SQLite persistence (SRP - the repository owns the SQL)
+        self._repository = repository
+        if repository is not None:
+            for student in repository.load_all_students():
+                self._track_student(student)
+            for teacher in repository.load_all_teachers():
+                self._teacher_mgr.add_teacher(teacher)
+        
+        # Set by load_snapshot: people not yet materialized
+        self._snapshot = None
     
     def get_school_name(self):
         return self._school_name
     
+    @metrics.instrument("school.save")
+    def save(self):
+        """Write pending changes to the repository; returns how many were written"""
+        if self._repository is None:
+            return 0
+        return self._repository.flush()
+    
+    def close(self):
+        """Write pending changes and close the repository, if there is one"""
+        if self._repository is not None:
+            self._repository.close()
+            self._repository = None
+    
+    # Snapshots
+    @metrics.instrument("school.save_snapshot")
+    def save_snapshot(self, path):
+        """Write every student and teacher to a binary snapshot; returns bytes written"""
+        self._ensure_loaded()
+        return SchoolSnapshot.write(path, self._school_name, self._student_mgr.get_all_students(),
+                                    self._teacher_mgr.get_all_teachers())
+    
+    @classmethod
+    @metrics.instrument("school.load_snapshot")
+    def load_snapshot(cls, path, notifier=None):
+        """Open a snapshot; students are built on first lookup, everyone else on first full scan"""
+        snapshot = SchoolSnapshot(path)
+        school = cls(snapshot.school_name, notifier)
+        school._snapshot = snapshot
+        return school
+    
+    def _ensure_loaded(self):
+        """Materialize whatever is still only in the snapshot"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return
+        self._snapshot = None
+        with metrics.timer("school.materialize_snapshot", rows=snapshot.student_count()):
+            for student in snapshot.iter_students():
+                if self._student_mgr.get_student(student.get_id()) is None:
+                    self._track_student(student)
+            for teacher in snapshot.iter_teachers():
+                self._teacher_mgr.add_teacher(teacher)
+        snapshot.close()
+    
     # Student operations
+    @metrics.instrument("school.add_student")
     def add_student(self, student):
-        return self._student_mgr.add_student(student)
-    
+        if self._snapshot is not None:
+            self.get_student(student.get_id())
+        if self._student_mgr.get_student(student.get_id()) is not None:
+            return False
+        # The repository refuses ids already in the database
+        if self._repository is not None and not self._repository.add_student(student):
+            return False
+        return self._track_student(student)
+    
+    def _track_student(self, student):
+        """Index the student and start counting its grades"""
+        added = self._student_mgr.add_student(student)
+        if added:
+            self._statistics.add_student(student)
+            self._rankings.add_student(student)
+        return added
+    
+    @metrics.instrument("school.get_student")
     def get_student(self, student_id):
-        return self._student_mgr.get_student(student_id)
+        student = self._student_mgr.get_student(student_id)
+        if student is None and self._snapshot is not None:
+            student = self._snapshot.find_student(student_id)
+            if student is not None:
+                self._track_student(student)
+        return student
     
+    @metrics.instrument("school.get_all_students", rows=len)
     def get_all_students(self):
+        self._ensure_loaded()
         return self._student_mgr.get_all_students()
     
+    @metrics.instrument("school.get_students_by_class", rows=len)
+    def get_students_by_class(self, student_class):
+        self._ensure_loaded()
+        return self._student_mgr.get_students_by_class(student_class)
+    
+    @metrics.instrument("school.get_students_by_grade_level", rows=len)
+    def get_students_by_grade_level(self, grade_level):
+        self._ensure_loaded()
+        return self._student_mgr.get_students_by_grade_level(grade_level)
+    
+    @metrics.instrument("school.search_students_by_name", rows=len)
+    def search_students_by_name(self, prefix):
+        self._ensure_loaded()
+        return self._student_mgr.search_by_name_prefix(prefix)
+    
     # Teacher operations
+    @metrics.instrument("school.add_teacher")
     def add_teacher(self, teacher):
+        self._ensure_loaded()
+        if self._teacher_mgr.get_teacher(teacher.get_id()) is not None:
+            return False
+        if self._repository is not None and not self._repository.add_teacher(teacher):
+            return False
         return self._teacher_mgr.add_teacher(teacher)
     
+    @metrics.instrument("school.get_all_teachers", rows=len)
     def get_all_teachers(self):
+        self._ensure_loaded()
         return self._teacher_mgr.get_all_teachers()
     
     # Grade operations
+    @metrics.instrument("school.calculate_student_gpa")
     def calculate_student_gpa(self, student_id):
-        student = self._student_mgr.get_student(student_id)
+        student = self.get_student(student_id)
         if student:
-            return self._grade_calc.calculate_gpa(student.get_grades())
+            return student.calculate_gpa(self._grade_calc)
         return 0.0
     
+    @metrics.instrument("school.calculate_all_gpas", rows=len)
+    def calculate_all_gpas(self):
+        """Get {student_id: GPA} for every student in one batch"""
+        students = self.get_all_students()
+        gpas = self._grade_calc.calculate_gpas(
+            [student.get_grade_values() for student in students])
+        return {student.get_id(): gpa for student, gpa in zip(students, gpas)}
+    
+    @metrics.instrument("school.get_letter_grade")
     def get_letter_grade(self, student_id):
-        student = self._student_mgr.get_student(student_id)
+        student = self.get_student(student_id)
         if student:
             avg = student.calculate_average()
             return self._grade_calc.calculate_letter_grade(avg)
         return "N/A"
     
     # Report operations
+    @metrics.instrument("school.generate_report")
     def generate_report(self, student_id):
-        student = self._student_mgr.get_student(student_id)
+        student = self.get_student(student_id)
         if student:
             return self._report_gen.generate_student_report(student)
         return "Student not found"
     
+    @metrics.instrument("school.generate_all_reports", rows=lambda result: result["reports"])
+    def generate_all_reports(self, output_dir=None, output_file=None, workers=None,
+                             chunk_size=500, progress=None, mp_context=None):
+        """Render every student report across a process pool, writing each chunk as it finishes.
+        
+        Reports go to output_dir/<student_id>.txt, or are appended to output_file.
+        progress(done, total, elapsed_seconds) is called after each chunk.
+        mp_context picks the multiprocessing start method (default: the platform's).
+        Returns {"reports", "seconds", "reports_per_sec"}.
+        """
+        if (output_dir is None) == (output_file is None):
+            raise ValueError("Give exactly one of output_dir or output_file")
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+            combined = None
+        else:
+            combined = open(output_file, "w", encoding="utf-8")
+        
+        def write(reports):
+            for student_id, report in reports:
+                if combined is not None:
+                    combined.write(report + "\n\n")
+                else:
+                    path = os.path.join(output_dir, f"{str(student_id).replace(os.sep, '_')}.txt")
+                    with open(path, "w", encoding="utf-8") as f:
+                        f.write(report)
+        
+        students = self.get_all_students()
+        total = len(students)
+        chunks = ([_student_report_row(student) for student in students[i:i + chunk_size]]
+                  for i in range(0, total, chunk_size))
+        workers = workers or os.cpu_count() or 1
+        done = 0
+        started = time.perf_counter()
+        
+        def collect(pending):
+            nonlocal done
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                reports = future.result()
+                write(reports)
+                done += len(reports)
+                if progress:
+                    progress(done, total, time.perf_counter() - started)
+            return pending
+        
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+                # Keep only a couple of chunks per worker in flight so memory
+                # stays bounded no matter how many students there are
+                pending = set()
+                for chunk in chunks:
+                    pending.add(pool.submit(report_worker.render_student_reports, chunk))
+                    if len(pending) >= workers * 2:
+                        pending = collect(pending)
+                while pending:
+                    pending = collect(pending)
+        finally:
+            if combined is not None:
+                combined.close()
+        seconds = time.perf_counter() - started
+        return {"reports": done, "seconds": seconds,
+                "reports_per_sec": done / seconds if seconds else 0.0}
+    
     # Statistics
+    @metrics.instrument("school.get_statistics")
     def get_statistics(self):
+        self._ensure_loaded()
         stats = f"\nSchool: {self._school_name}\n"
         stats += f"Students: {self._student_mgr.count()}\n"
         stats += f"Teachers: {self._teacher_mgr.count()}\n"
         stats += "-" * 30
         return stats
+    
+    @metrics.instrument("school.get_grade_statistics")
+    def get_grade_statistics(self):
+        """Live GradeStatistics for the whole school; reading it never rescans students"""
+        self._ensure_loaded()
+        return self._statistics
+    
+    # Payroll
+    @metrics.instrument("school.run_payroll", rows=lambda payroll: payroll["teachers"])
+    def run_payroll(self, engine=None):
+        """Tax, net pay and per-subject/per-band totals for all teachers"""
+        return (engine or self._payroll).run(self.get_all_teachers())
+    
+    # Rankings
+    @metrics.instrument("school.get_top_students", rows=len)
+    def get_top_students(self, n=10, student_class=None):
+        """[(student, average)] for the n best averages, school-wide or in one class"""
+        self._ensure_loaded()
+        return self._rankings.top(n, student_class)
+    
+    @metrics.instrument("school.get_student_rank")
+    def get_student_rank(self, student_id, student_class=None):
+        """(rank, ranked students, percentile) or None if the student has no grades"""
+        self._ensure_loaded()
+        rank = self._rankings.rank(student_id, student_class)
+        if rank is None:
+            return None
+        return (rank, self._rankings.count(student_class),
+                self._rankings.percentile(student_id, student_class))
 
 
 
@@ -517,6 +2198,35 @@ def main():
     print("="*50)
     print(s1.display_info())
     
+    # Grade statistics
+    print("\n" + "="*50)
+    print("GRADE STATISTICS")
+    print("="*50)
+    statistics = school.get_grade_statistics()
+    for subject in statistics.subjects():
+        distribution = statistics.for_subject(subject)
+        print(f"{subject}: n={distribution.count}, mean={distribution.mean:.2f}, "
+              f"stddev={distribution.stddev():.2f}, median={distribution.quantile(0.5):g}")
+    
+    # Rankings
+    print("\n" + "="*50)
+    print("TOP STUDENTS")
+    print("="*50)
+    for position, (student, average) in enumerate(school.get_top_students(3), 1):
+        rank, ranked, percentile = school.get_student_rank(student.get_id())
+        print(f"{position}. {student.get_name()}: {average:.2f} (rank {rank}/{ranked}, "
+              f"percentile {percentile:.0f})")
+    
+    # Payroll
+    print("\n" + "="*50)
+    print("PAYROLL")
+    print("="*50)
+    payroll = school.run_payroll()
+    for subject, row in payroll["by_subject"].items():
+        print(f"{subject}: {row['teachers']} teacher(s), gross=${row['gross']:.2f}, "
+              f"tax=${row['tax']:.2f}, net=${row['net']:.2f}")
+    print(f"Total: gross=${payroll['gross']:.2f}, tax=${payroll['tax']:.2f}, net=${payroll['net']:.2f}")
+    
     # Calculate grades
     print("\n" + "="*50)
     print("GRADE CALCULATIONS")
@@ -549,5 +2259,62 @@ def main():
     print("="*50 + "\n")
 
 
+def run_synthetic_load(size, seed=42):
+    """Build a school of `size` people and run the main operations over it"""
+    rng = random.Random(seed)
+    subjects = ("Math", "English", "Science", "History", "Art")
+    classes = [f"{level}-{section}" for level in range(1, 13) for section in "ABC"]
+    school = School("Synthetic School")
+    teachers = max(1, size // 21)
+    for i in range(size - teachers):
+        student_class = rng.choice(classes)
+        student = Student(f"S{i:07d}", f"Student {i}", rng.randint(6, 18), "0123456789",
+                          int(student_class.split("-")[0]), student_class)
+        for subject in rng.sample(subjects, rng.randint(1, len(subjects))):
+            student.add_grade(subject, rng.randint(30, 100))
+        school.add_student(student)
+    for i in range(teachers):
+        teacher = Teacher(f"T{i:06d}", f"Teacher {i}", rng.randint(25, 65), "0111111111",
+                          rng.choice(subjects), rng.randrange(3000, 9000, 50))
+        teacher.add_class(rng.choice(classes))
+        school.add_teacher(teacher)
+    
+    students = school.get_all_students()
+    for student in students:
+        school.calculate_student_gpa(student.get_id())
+        school.get_letter_grade(student.get_id())
+        school.generate_report(student.get_id())
+    school.calculate_all_gpas()
+    for student_class in classes:
+        school.get_students_by_class(student_class)
+    school.search_students_by_name("Student 1")
+    statistics = school.get_grade_statistics()
+    for student_class in classes:
+        statistics.for_class(student_class)
+    statistics.summary()
+    for student_class in classes:
+        school.get_top_students(10, student_class)
+    for student in students[:1000]:
+        school.get_student_rank(student.get_id(), student.get_class())
+    school.run_payroll()
+    school.run_payroll(PayrollEngine(((0, 0.0), (3000, 0.1), (6000, 0.2)), progressive=True))
+    print(school.get_statistics())
+
+
+def cli(argv=None):
+    """Run the demo, or a synthetic workload, optionally under the profiler"""
+    parser = argparse.ArgumentParser(description="School Management System demo")
+    profiling.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.synthetic:
+        target, target_args = run_synthetic_load, (args.synthetic,)
+    else:
+        target, target_args = main, ()
+    if args.profile:
+        profiling.run_profiled(target, args, *target_args)
+    else:
+        target(*target_args)
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,424 @@
+# SCHOOL API
+# Local JSON HTTP service over the school_db data layer and the School model
+# from "school system.py", for tools that should not go through SchoolGUI.
+#
+#   python school_api.py --db school.db --port 8765
+#
+# Requests are handled by a fixed pool of threads; school_db gives each of
+# them its own long-lived SQLite connection, so connections are reused
+# across requests instead of opened per call.
+
+import argparse
+import importlib.util
+import json
+import os
+import select
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import metrics
+import school_db
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+MAX_PAGE_SIZE = 1000
+MAX_BODY_BYTES = 64 * 1024
+ROUTE_ROOTS = ("students", "teachers", "averages", "feedback", "grades", "school", "payroll", "metrics")
+
+
+class ApiError(Exception):
+    """Turned into a JSON error response with the given HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _load_school_system():
+    """Import "school system.py" (its file name has a space in it)"""
+    module = sys.modules.get("school_system")
+    if module is None:
+        spec = importlib.util.spec_from_file_location("school_system", os.path.join(ROOT, "school system.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["school_system"] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+class SchoolModel:
+    """A School loaded from the database, rebuilt when the database has changed
+
+    School is not thread-safe, so every call goes through one lock. Rebuilding
+    reads every student, so it happens at most once per refresh_seconds; in
+    between, School answers may lag the tables by that long.
+    """
+
+    def __init__(self, path, name="School", refresh_seconds=2.0):
+        self.path = path
+        self.name = name
+        self.refresh_seconds = refresh_seconds
+        self._school = None
+        self._stamp = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, method, *args):
+        """School.method(*args) on an up-to-date School"""
+        with self._lock:
+            stamp = school_db.query_cache.stamp()
+            if self._school is None or (stamp != self._stamp
+                                        and time.monotonic() - self._loaded_at >= self.refresh_seconds):
+                self._reload(stamp)
+            return getattr(self._school, method)(*args)
+
+    def _reload(self, stamp):
+        system = _load_school_system()
+        with metrics.timer("api.school_reload"):
+            repository = system.SchoolRepository(self.path)
+            self._school = system.School(self.name, repository=repository)
+            # Read-only here: writes go through school_db, so drop the repository's connection
+            repository.close()
+        self._stamp = stamp
+        self._loaded_at = time.monotonic()
+
+
+def _row_dict(columns, row):
+    return dict(zip(columns, row))
+
+
+def _page_size(query):
+    try:
+        limit = int(query.get("limit", school_db.PAGE_SIZE))
+    except ValueError:
+        raise ApiError(400, "limit must be an integer")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ApiError(400, f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit
+
+
+def list_page(kind, query):
+    """One keyset page of a listing, with the cursor for the next page"""
+    fetch, columns = school_db.LISTINGS[kind]
+    limit = _page_size(query)
+    cursor = query.get("after")
+    if cursor is not None and kind == "feedback":
+        try:
+            cursor = int(cursor)  # feedback pages newest first by integer id
+        except ValueError:
+            raise ApiError(400, "after must be an integer for feedback")
+    rows = fetch(cursor, limit)
+    return {
+        "items": [_row_dict(columns, row) for row in rows],
+        "next": rows[-1][0] if len(rows) == limit else None,
+    }
+
+
+def get_student(student_id):
+    row = school_db.find_student(student_id)
+    if row is None:
+        raise ApiError(404, f"no student {student_id!r}")
+    student = _row_dict(school_db.STUDENT_FIELDS, row)
+    student["grades"] = dict(school_db.load_grades(student_id))
+    return student
+
+
+def get_teacher(teacher_id):
+    row = school_db.find_teacher(teacher_id)
+    if row is None:
+        raise ApiError(404, f"no teacher {teacher_id!r}")
+    return _row_dict(school_db.TEACHER_FIELDS, row)
+
+
+def add_person(kind, body):
+    """Insert one student or teacher with the same validation as CSV import"""
+    fields = school_db.STUDENT_FIELDS if kind == "students" else school_db.TEACHER_FIELDS
+    record = {field: str(body[field]) if body.get(field) is not None else "" for field in fields}
+    result = school_db.bulk_import(kind, [(1, record)])
+    if result.rejected:
+        reason = result.rejected[0][1]
+        raise ApiError(409 if "UNIQUE" in reason else 400, reason)
+    return {"added": record["id"]}
+
+
+def add_grade(body):
+    try:
+        student_id, subject, grade = body["student_id"], body["subject"], float(body["grade"])
+    except (KeyError, TypeError, ValueError):
+        raise ApiError(400, "expected student_id, subject and a numeric grade")
+    try:
+        added = school_db.add_grade_to_db(student_id, subject, grade)
+    except ValueError as error:
+        raise ApiError(404, str(error))
+    if not added:
+        raise ApiError(400, "grade must be between 0 and 100")
+    return {"student_id": student_id, "subject": subject, "grade": grade}
+
+
+def add_feedback(body):
+    try:
+        person_id, role, comment = body["person_id"], body["role"], body["comment"]
+    except KeyError:
+        raise ApiError(400, "expected person_id, role and comment")
+    if role not in ("Student", "Teacher"):
+        raise ApiError(400, "role must be Student or Teacher")
+    school_db.add_feedback(person_id, role, comment)
+    return {"added": True}
+
+
+def school_statistics(model):
+    statistics = model.call("get_grade_statistics")
+    return {
+        "students": len(model.call("get_all_students")),
+        "teachers": len(model.call("get_all_teachers")),
+        "grades": statistics.summary(),
+    }
+
+
+def school_top(model, query):
+    students = model.call("get_top_students", _page_size({"limit": query.get("n", 10)}), query.get("class"))
+    return {"items": [{"id": student.get_id(), "name": student.get_name(), "class": student.get_class(),
+                       "average": average} for student, average in students]}
+
+
+def school_rank(model, student_id, query):
+    ranking = model.call("get_student_rank", student_id, query.get("class"))
+    if ranking is None:
+        raise ApiError(404, f"student {student_id!r} is not ranked (unknown, ungraded or not in that class)")
+    rank, ranked, percentile = ranking
+    return {"id": student_id, "rank": rank, "of": ranked, "percentile": percentile}
+
+
+def school_gpa(model, student_id):
+    if model.call("get_student", student_id) is None:
+        raise ApiError(404, f"no student {student_id!r}")
+    return {"id": student_id, "gpa": model.call("calculate_student_gpa", student_id),
+            "letter": model.call("get_letter_grade", student_id)}
+
+
+def get_payroll(query):
+    try:
+        brackets = school_db.parse_brackets(query["brackets"]) if "brackets" in query \
+            else school_db.PAYROLL_BRACKETS
+    except ValueError as error:
+        raise ApiError(400, str(error))
+    return school_db.payroll(brackets, query.get("progressive") in ("1", "true"))
+
+
+def _route_name(parts):
+    """Path with ids replaced, so metrics get one series per endpoint"""
+    if not parts or parts[0] not in ROUTE_ROOTS:
+        return "other"
+    if parts[0] in ("students", "teachers") and len(parts) > 1:
+        parts = [parts[0], "{id}"] + parts[2:3]
+    elif parts[0] == "school" and len(parts) > 2:
+        parts = parts[:2] + ["{id}"]
+    return "/" + "/".join(parts[:3])
+
+
+class SchoolRequestHandler(BaseHTTPRequestHandler):
+    """Routes /students, /teachers, /averages, /feedback, /grades and /school/* to JSON"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so load tests reuse connections
+    timeout = 30  # longest a single read or write of a request may block
+    # A connection waiting for its next request still holds a pool thread, so
+    # it is closed after idle_timeout, or at once when connections are queued
+    idle_timeout = 5.0
+    idle_poll = 0.05
+    # Headers and body go out as separate writes; with Nagle on, the body waits
+    # for the client's delayed ACK (~40ms per request)
+    disable_nagle_algorithm = True
+    server_version = "SchoolAPI/1.0"
+
+    def handle(self):
+        while self._next_request_ready():
+            self.handle_one_request()
+            if self.close_connection:
+                break
+
+    def _next_request_ready(self):
+        """Wait for another request on this connection; False means close it"""
+        try:
+            # a pipelined request may already sit in rfile's buffer, where
+            # select cannot see it; a non-blocking peek returns it without waiting
+            self.connection.settimeout(0)
+            if self.rfile.peek(1):
+                return True
+            self.connection.settimeout(self.timeout)
+            deadline = time.monotonic() + self.idle_timeout
+            while True:
+                readable, _, _ = select.select([self.connection], [], [], self.idle_poll)
+                if readable:
+                    return True
+                if self.server.saturated() or time.monotonic() >= deadline:
+                    return False
+        except OSError:
+            return False
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        parts = [unquote(part) for part in url.path.strip("/").split("/") if part]
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        with metrics.timer(f"api.{method} {_route_name(parts)}"):
+            try:
+                status, payload = 200, self._route(method, parts, query)
+            except ApiError as error:
+                status, payload = error.status, {"error": str(error)}
+            except Exception as error:  # report, but keep the server up
+                self.log_error("%s %s failed: %r", method, self.path, error)
+                status, payload = 500, {"error": "internal error"}
+            if isinstance(payload, str):
+                self._send(status, payload.encode(), "text/plain; version=0.0.4")
+            else:
+                self._send(status, json.dumps(payload).encode(), "application/json")
+
+    def _route(self, method, parts, query):
+        model = self.server.model
+        if method == "POST":
+            body = self._read_json()
+            if parts in (["students"], ["teachers"]):
+                return add_person(parts[0], body)
+            if parts == ["grades"]:
+                return add_grade(body)
+            if parts == ["feedback"]:
+                return add_feedback(body)
+            raise ApiError(404, f"no POST endpoint {self.path}")
+        if len(parts) == 1 and parts[0] in school_db.LISTINGS:
+            return list_page(parts[0], query)
+        if parts == ["feedback", "search"]:
+            if not query.get("q"):
+                raise ApiError(400, "q is required")
+            return {"items": [_row_dict(school_db.FEEDBACK_FIELDS, row) for row in
+                              school_db.search_feedback(query["q"], _page_size(query))]}
+        if len(parts) == 2 and parts[0] == "students":
+            return get_student(parts[1])
+        if len(parts) == 3 and parts[0] == "students" and parts[2] == "grades":
+            get_student(parts[1])
+            return {"items": dict(school_db.load_grades(parts[1]))}
+        if len(parts) == 2 and parts[0] == "teachers":
+            return get_teacher(parts[1])
+        if parts == ["school", "statistics"]:
+            return school_statistics(model)
+        if parts == ["school", "top"]:
+            return school_top(model, query)
+        if len(parts) == 3 and parts[:2] == ["school", "rank"]:
+            return school_rank(model, parts[2], query)
+        if len(parts) == 3 and parts[:2] == ["school", "gpa"]:
+            return school_gpa(model, parts[2])
+        if parts == ["payroll"]:
+            return get_payroll(query)
+        if parts == ["metrics"]:
+            return metrics.registry.to_prometheus()
+        raise ApiError(404, f"no GET endpoint {self.path}")
+
+    def _read_json(self):
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            raise ApiError(400, "bad Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise ApiError(413, "request body too large")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise ApiError(400, "request body is not valid JSON")
+        if not isinstance(body, dict):
+            raise ApiError(400, "request body must be a JSON object")
+        return body
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.saturated():
+            self.send_header("Connection", "close")  # give the thread to a queued connection
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ThreadPoolHTTPServer(HTTPServer):
+    """HTTPServer that hands each connection to a fixed pool of worker threads
+
+    Unlike ThreadingHTTPServer there is no thread per connection, so the
+    number of threads - and of SQLite connections - stays at `workers`.
+    Connections beyond that wait in the pool's queue until a thread is free.
+    """
+
+    def __init__(self, address, handler, model, workers=16, verbose=False):
+        super().__init__(address, handler)
+        self.model = model
+        self.verbose = verbose
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api")
+        self._connections = 0  # accepted and not yet closed, queued ones included
+        self._connections_lock = threading.Lock()
+
+    def saturated(self):
+        """True while accepted connections are waiting for a free thread"""
+        return self._connections > self.workers
+
+    def process_request(self, request, client_address):
+        with self._connections_lock:
+            self._connections += 1
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            with self._connections_lock:
+                self._connections -= 1
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+def make_server(db_path, host="127.0.0.1", port=8765, workers=16, refresh_seconds=2.0, verbose=False):
+    """Open the database and build a server; call serve_forever() on the result"""
+    school_db.configure_db(db_path)
+    school_db.init_db()
+    model = SchoolModel(db_path, refresh_seconds=refresh_seconds)
+    return ThreadPoolHTTPServer((host, port), SchoolRequestHandler, model, workers, verbose)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="School JSON HTTP API")
+    parser.add_argument("--db", default=school_db.DB_PATH, help=f"SQLite database (default: {school_db.DB_PATH})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    parser.add_argument("--workers", type=int, default=16, help="request threads (default: 16)")
+    parser.add_argument("--refresh", type=float, default=2.0, metavar="SECONDS",
+                        help="rebuild the School model at most this often after writes (default: 2)")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+    server = make_server(args.db, args.host, args.port, args.workers, args.refresh, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        school_db.close_db()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
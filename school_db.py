@@ -0,0 +1,754 @@
+# Data layer for "school project.py": SQLite connections, queries, query cache,
+# bulk import and the Student/Teacher records. Nothing here imports tkinter,
+# so scripts and servers can use it without a display.
+import csv
+import json
+import re
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+
+import metrics
+
+# Database Connection
+DB_PATH="school.db"
+SYNCHRONOUS_LEVELS=("OFF","NORMAL","FULL","EXTRA")
+
+class ConnectionPool:
+    """One long-lived connection per thread, opened lazily and reused by every helper."""
+    def __init__(self,path=DB_PATH,synchronous="NORMAL",journal_mode="WAL",cached_statements=128,timeout=5.0):
+        synchronous=synchronous.upper()
+        if synchronous not in SYNCHRONOUS_LEVELS:
+            raise ValueError(f"synchronous must be one of {SYNCHRONOUS_LEVELS}, got {synchronous!r}")
+        self.path=path
+        self.synchronous=synchronous
+        self.journal_mode=journal_mode
+        self.cached_statements=cached_statements
+        self.timeout=timeout
+        self._local=threading.local()
+        self._lock=threading.Lock()
+        self._conns=[]
+
+    def connection(self):
+        conn=getattr(self._local,"conn",None)
+        if conn is None:
+            # sqlite3 keeps an LRU of compiled statements per connection, so reusing the
+            # connection with constant SQL text skips re-preparing each statement
+            conn=sqlite3.connect(self.path,timeout=self.timeout,check_same_thread=False,
+                                 cached_statements=self.cached_statements)
+            conn.execute(f"pragma journal_mode={self.journal_mode}")
+            conn.execute(f"pragma synchronous={self.synchronous}")
+            self._local.conn=conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def close_all(self):
+        with self._lock:
+            conns,self._conns=self._conns,[]
+        for conn in conns:
+            conn.close()
+        self._local=threading.local()
+
+_pool=None
+_pool_lock=threading.Lock()
+
+def configure_db(path=DB_PATH,**options):
+    """Point every database helper at `path`; options are passed to ConnectionPool."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        _pool=ConnectionPool(path,**options)
+    query_cache.clear()
+    return _pool
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool=ConnectionPool()
+    return _pool
+
+def get_connection():
+    return get_pool().connection()
+
+def close_db():
+    if _pool is not None:
+        _pool.close_all()
+
+# Query Cache
+_write_count=0
+_write_lock=threading.Lock()
+
+def note_write():
+    """Bump the write counter; every cached query result becomes stale."""
+    global _write_count
+    with _write_lock:
+        _write_count+=1
+
+@contextmanager
+def write_transaction():
+    conn=get_connection()
+    try:
+        with conn:
+            yield conn
+    finally:
+        note_write()
+
+class QueryCache:
+    """LRU of query results keyed on (query, args), emptied whenever the database changes.
+
+    Writes made through this module bump a counter; writes from other processes
+    show up in PRAGMA data_version. Cached rows are shared, so callers must not mutate them.
+    """
+    def __init__(self,max_entries=256):
+        self.max_entries=max_entries
+        self.hits=0
+        self.misses=0
+        self._entries=OrderedDict()
+        self._stamp=None
+        self._versions={}
+        self._external_writes=0
+        self._lock=threading.Lock()
+
+    def stamp(self):
+        """Value that changes whenever the database is written, by this process or another."""
+        # data_version is per connection and only moves when some *other*
+        # connection commits, so compare it against what this connection saw
+        # last. A connection seen for the first time has no baseline: anything
+        # may have been committed before it opened, so that counts as a change
+        conn=get_connection()
+        version=conn.execute("pragma data_version").fetchone()[0]
+        with self._lock:
+            if self._versions.get(conn)!=version:
+                self._external_writes+=1
+            self._versions[conn]=version
+            return (_write_count,self._external_writes)
+
+    def get(self,key,load):
+        stamp=self.stamp()
+        with self._lock:
+            if stamp!=self._stamp:
+                self._entries.clear()
+                self._stamp=stamp
+            elif key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits+=1
+                return self._entries[key]
+            self.misses+=1
+        value=load()
+        with self._lock:
+            # only keep it if nothing was written while the query ran
+            if stamp==self._stamp:
+                self._entries[key]=value
+                if len(self._entries)>self.max_entries:
+                    self._entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stamp=None
+            self._versions.clear()
+
+    def stats(self):
+        return {"entries":len(self._entries),"hits":self.hits,"misses":self.misses}
+
+query_cache=QueryCache()
+
+def cached_query(fn):
+    @wraps(fn)
+    def wrapper(*args,**kwargs):
+        return query_cache.get((fn.__name__,args,tuple(sorted(kwargs.items()))),lambda:fn(*args,**kwargs))
+    wrapper.uncached=fn
+    return wrapper
+
+# Database Functions
+INSERT_STUDENT="""insert into students (id,name,age,phone,grade,student_class)
+                  values (?,?,?,?,?,?)"""
+INSERT_TEACHER="""insert into teachers (id,name,age,phone,subject,salary)
+                  values (?,?,?,?,?,?)"""
+INSERT_FEEDBACK="insert into feedback (person_id,role,comment) values (?,?,?)"
+SELECT_STUDENTS="select * from students order by id"
+SELECT_TEACHERS="select * from teachers order by id"
+SELECT_FEEDBACK="select * from feedback order by id DESC"
+UPSERT_GRADE="""insert into grades (student_id,subject,grade) values (?,?,?)
+                on conflict(student_id,subject) do update set grade=excluded.grade"""
+SELECT_STUDENT_AVERAGES="""select s.*,coalesce(g.total/g.count,0) from students s
+                           left join grade_totals g on g.student_id=s.id"""
+PAGE_SIZE=200
+
+@metrics.instrument("db.init_db")
+def init_db():
+    create_schema(get_connection())
+    note_write()
+
+def create_schema(conn):
+    """Create every table, index and trigger on `conn`; also used by SchoolRepository in "school system.py"."""
+    had_totals=conn.execute("select 1 from sqlite_master where name='grade_totals'").fetchone()
+    with conn:
+        conn.execute("""create table if not exists students (
+                            id text primary key,
+                            name text,
+                            age integer,
+                            phone text,
+                            grade integer,
+                            student_class text)""")
+        conn.execute(""" create table if not exists teachers (
+                            id text primary key,
+                            name text,
+                            age integer,
+                            phone text,
+                            subject text,
+                            salary real)""")
+        conn.execute("""create table if not exists feedback (
+                            id integer primary key autoincrement,
+                            person_id text,
+                            role text,
+                            comment text)""")
+        conn.execute("""create table if not exists grades (
+                            student_id text not null,
+                            subject text not null,
+                            grade real not null check (grade between 0 and 100),
+                            primary key (student_id,subject))""")
+        conn.execute("create index if not exists idx_grades_subject on grades (subject,grade)")
+        # a trigger rather than a foreign key: it also guards databases created
+        # before this check, and needs no pragma on every connection
+        conn.execute("""create trigger if not exists grades_bi before insert on grades
+                        when not exists (select 1 from students where id=new.student_id) begin
+                            select raise(abort,'no such student');
+                        end""")
+        conn.execute("""create table if not exists teacher_classes (
+                            teacher_id text not null,
+                            class_name text not null,
+                            primary key (teacher_id,class_name))""")
+        # per-student running sum/count kept current by triggers, so averages
+        # never need a scan of the grades table
+        conn.execute("""create table if not exists grade_totals (
+                            student_id text primary key,
+                            total real not null,
+                            count integer not null)""")
+        conn.execute("""create trigger if not exists grades_ai after insert on grades begin
+                            insert into grade_totals (student_id,total,count) values (new.student_id,new.grade,1)
+                            on conflict(student_id) do update set total=total+new.grade,count=count+1;
+                        end""")
+        conn.execute("""create trigger if not exists grades_au after update of grade on grades begin
+                            update grade_totals set total=total-old.grade+new.grade where student_id=new.student_id;
+                        end""")
+        conn.execute("""create trigger if not exists grades_ad after delete on grades begin
+                            update grade_totals set total=total-old.grade,count=count-1 where student_id=old.student_id;
+                            delete from grade_totals where student_id=old.student_id and count<=0;
+                        end""")
+        if not had_totals:
+            # grades written before the summary table existed
+            conn.execute("""insert into grade_totals (student_id,total,count)
+                            select student_id,sum(grade),count(*) from grades group by student_id""")
+    init_feedback_search(conn)
+
+def init_feedback_search(conn):
+    """Create the FTS5 index over feedback comments; returns False when SQLite lacks FTS5."""
+    existed=conn.execute("select 1 from sqlite_master where name='feedback_fts'").fetchone()
+    try:
+        with conn:
+            # external-content table: the text lives only in feedback, triggers keep the index in step
+            conn.execute("""create virtual table if not exists feedback_fts using fts5 (
+                                comment,content='feedback',content_rowid='id')""")
+            conn.execute("""create trigger if not exists feedback_fts_ai after insert on feedback begin
+                                insert into feedback_fts (rowid,comment) values (new.id,new.comment);
+                            end""")
+            conn.execute("""create trigger if not exists feedback_fts_ad after delete on feedback begin
+                                insert into feedback_fts (feedback_fts,rowid,comment) values ('delete',old.id,old.comment);
+                            end""")
+            conn.execute("""create trigger if not exists feedback_fts_au after update of comment on feedback begin
+                                insert into feedback_fts (feedback_fts,rowid,comment) values ('delete',old.id,old.comment);
+                                insert into feedback_fts (rowid,comment) values (new.id,new.comment);
+                            end""")
+    except sqlite3.OperationalError:
+        return False
+    if not existed:
+        rebuild_feedback_search(conn)
+    return True
+
+def rebuild_feedback_search(conn=None):
+    """Re-index every existing feedback comment."""
+    conn=conn or get_connection()
+    with conn:
+        conn.execute("insert into feedback_fts (feedback_fts) values ('rebuild')")
+    note_write()
+
+def student_row(s):
+    return (s.id,s.name,s.age,s.phone,s.grade,s.student_class)
+
+def teacher_row(t):
+    return (t.id,t.name,t.age,t.phone,t.subject,t.salary)
+
+@metrics.instrument("db.add_student_to_db")
+def add_student_to_db(s):
+    with write_transaction() as conn:
+        conn.execute(INSERT_STUDENT,student_row(s))
+
+@metrics.instrument("db.add_teacher_to_db")
+def add_teacher_to_db(t):
+    with write_transaction() as conn:
+        conn.execute(INSERT_TEACHER,teacher_row(t))
+
+@metrics.instrument("db.add_feedback")
+def add_feedback(person_id,role,comment):
+    with write_transaction() as conn:
+        conn.execute(INSERT_FEEDBACK,(person_id,role,comment))
+
+@metrics.instrument("db.load_students",rows=len)
+@cached_query
+def load_students():
+    return get_connection().execute(SELECT_STUDENTS).fetchall()
+
+@metrics.instrument("db.load_teachers",rows=len)
+@cached_query
+def load_teachers():
+    return get_connection().execute(SELECT_TEACHERS).fetchall()
+
+@metrics.instrument("db.load_feedback",rows=len)
+@cached_query
+def load_feedback():
+    return get_connection().execute(SELECT_FEEDBACK).fetchall()
+
+@metrics.instrument("db.add_grade_to_db")
+def add_grade_to_db(student_id,subject,grade):
+    """Add or update one grade, same rule as Student.add_grade; returns False when out of range.
+
+    Raises ValueError when no student has that id.
+    """
+    if not 0<=grade<=100:
+        return False
+    try:
+        with write_transaction() as conn:
+            conn.execute(UPSERT_GRADE,(student_id,subject,grade))
+    except sqlite3.IntegrityError as e:
+        if "no such student" not in str(e):
+            raise
+        raise ValueError(f"no student {student_id!r}") from None
+    return True
+
+@metrics.instrument("db.find_student")
+@cached_query
+def find_student(student_id):
+    return get_connection().execute("select * from students where id=?",(student_id,)).fetchone()
+
+@metrics.instrument("db.find_teacher")
+@cached_query
+def find_teacher(teacher_id):
+    return get_connection().execute("select * from teachers where id=?",(teacher_id,)).fetchone()
+
+@metrics.instrument("db.load_grades",rows=len)
+@cached_query
+def load_grades(student_id):
+    return get_connection().execute("select subject,grade from grades where student_id=? order by subject",
+                                    (student_id,)).fetchall()
+
+@metrics.instrument("db.load_student_averages",rows=len)
+@cached_query
+def load_student_averages():
+    """Student rows with their average grade appended, from one query."""
+    return get_connection().execute(SELECT_STUDENT_AVERAGES+" order by s.id").fetchall()
+
+# Keyset pagination: each page starts after the last id of the previous one,
+# so fetching page N costs the same as page 1 (no OFFSET scan)
+@metrics.instrument("db.load_students_page",rows=len)
+@cached_query
+def load_students_page(after_id=None,limit=PAGE_SIZE):
+    conn=get_connection()
+    if after_id is None:
+        return conn.execute("select * from students order by id limit ?",(limit,)).fetchall()
+    return conn.execute("select * from students where id>? order by id limit ?",(after_id,limit)).fetchall()
+
+@metrics.instrument("db.load_teachers_page",rows=len)
+@cached_query
+def load_teachers_page(after_id=None,limit=PAGE_SIZE):
+    conn=get_connection()
+    if after_id is None:
+        return conn.execute("select * from teachers order by id limit ?",(limit,)).fetchall()
+    return conn.execute("select * from teachers where id>? order by id limit ?",(after_id,limit)).fetchall()
+
+@metrics.instrument("db.load_student_averages_page",rows=len)
+@cached_query
+def load_student_averages_page(after_id=None,limit=PAGE_SIZE):
+    conn=get_connection()
+    if after_id is None:
+        return conn.execute(SELECT_STUDENT_AVERAGES+" order by s.id limit ?",(limit,)).fetchall()
+    return conn.execute(SELECT_STUDENT_AVERAGES+" where s.id>? order by s.id limit ?",(after_id,limit)).fetchall()
+
+def _fts_query(text):
+    # quote each word so user input can't be parsed as FTS syntax; the trailing *
+    # makes the last word a prefix match for search-as-you-type
+    words=re.findall(r"\w+",text)
+    return " ".join(f'"{w}"*' for w in words)
+
+@metrics.instrument("db.search_feedback",rows=len)
+@cached_query
+def search_feedback(text,limit=PAGE_SIZE):
+    """Feedback rows whose comment matches every word of text, best match first."""
+    query=_fts_query(text)
+    if not query:
+        return []
+    conn=get_connection()
+    try:
+        return conn.execute("""select f.* from feedback_fts join feedback f on f.id=feedback_fts.rowid
+                               where feedback_fts match ? order by rank limit ?""",(query,limit)).fetchall()
+    except sqlite3.OperationalError:
+        # no FTS5 in this SQLite build: fall back to an unranked scan
+        sql="select * from feedback where "+" and ".join(["comment like ?"]*len(query.split()))+" order by id DESC limit ?"
+        return conn.execute(sql,[f"%{w}%" for w in re.findall(r"\w+",text)]+[limit]).fetchall()
+
+@metrics.instrument("db.load_feedback_page",rows=len)
+@cached_query
+def load_feedback_page(before_id=None,limit=PAGE_SIZE):
+    conn=get_connection()
+    if before_id is None:
+        return conn.execute("select * from feedback order by id DESC limit ?",(limit,)).fetchall()
+    return conn.execute("select * from feedback where id<? order by id DESC limit ?",(before_id,limit)).fetchall()
+
+# Bulk Import
+STUDENT_FIELDS=("id","name","age","phone","grade","student_class")
+TEACHER_FIELDS=("id","name","age","phone","subject","salary")
+
+def _text(value,field):
+    value=(value or "").strip()
+    if not value:
+        raise ValueError(f"{field} is empty")
+    return value
+
+def _parse_student(r):
+    return (_text(r.get("id"),"id"),_text(r.get("name"),"name"),int(r.get("age") or ""),
+            (r.get("phone") or "").strip(),int(r.get("grade") or ""),_text(r.get("student_class"),"student_class"))
+
+def _parse_teacher(r):
+    return (_text(r.get("id"),"id"),_text(r.get("name"),"name"),int(r.get("age") or ""),
+            (r.get("phone") or "").strip(),_text(r.get("subject"),"subject"),float(r.get("salary") or ""))
+
+IMPORT_KINDS={"students":(_parse_student,INSERT_STUDENT),
+              "teachers":(_parse_teacher,INSERT_TEACHER)}
+
+def iter_csv(path):
+    """Yield (line_number, record) pairs without reading the whole file."""
+    with open(path,newline="",encoding="utf-8") as f:
+        reader=csv.DictReader(f)
+        for record in reader:
+            yield reader.line_num,record
+
+class ImportResult:
+    def __init__(self,kind):
+        self.kind=kind
+        self.inserted=0
+        self.rejected=[]
+        self.seconds=0.0
+
+    def rows_per_sec(self):
+        return self.inserted/self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        return (f"{self.kind}: {self.inserted} inserted, {len(self.rejected)} rejected "
+                f"in {self.seconds:.2f}s ({self.rows_per_sec():.0f} rows/sec)")
+
+def _insert_chunk(conn,sql,chunk,result):
+    try:
+        with conn:
+            conn.executemany(sql,[row for _,row in chunk])
+        result.inserted+=len(chunk)
+    except sqlite3.IntegrityError:
+        # one bad row fails the whole executemany, so replay the chunk row by row
+        # in a single transaction to find out which rows are rejected
+        with conn:
+            for line,row in chunk:
+                try:
+                    conn.execute(sql,row)
+                    result.inserted+=1
+                except sqlite3.IntegrityError as e:
+                    result.rejected.append((line,str(e)))
+    finally:
+        note_write()
+
+@metrics.instrument("db.bulk_import",rows=lambda result:result.inserted)
+def bulk_import(kind,records,chunk_size=5000):
+    """Insert (line, record-dict) pairs into `kind` ("students"/"teachers") in chunked transactions."""
+    if kind not in IMPORT_KINDS:
+        raise ValueError(f"unknown import kind {kind!r}")
+    parse,sql=IMPORT_KINDS[kind]
+    conn=get_connection()
+    result=ImportResult(kind)
+    start=time.perf_counter()
+    chunk=[]
+    for line,record in records:
+        try:
+            chunk.append((line,parse(record)))
+        except (ValueError,TypeError) as e:
+            result.rejected.append((line,str(e)))
+            continue
+        if len(chunk)>=chunk_size:
+            _insert_chunk(conn,sql,chunk,result)
+            chunk=[]
+    if chunk:
+        _insert_chunk(conn,sql,chunk,result)
+    result.seconds=time.perf_counter()-start
+    return result
+
+def import_csv(kind,path,chunk_size=5000):
+    return bulk_import(kind,iter_csv(path),chunk_size)
+
+# Listings: page function and column names for each table the headless
+# commands can list or export
+FEEDBACK_FIELDS=("id","person_id","role","comment")
+LISTINGS={"students":(load_students_page,STUDENT_FIELDS),
+          "teachers":(load_teachers_page,TEACHER_FIELDS),
+          "averages":(load_student_averages_page,STUDENT_FIELDS+("average",)),
+          "feedback":(load_feedback_page,FEEDBACK_FIELDS)}
+
+def iter_pages(fetch,start=None,page_size=PAGE_SIZE):
+    """Yield every row of a keyset-paged listing, one page in memory at a time."""
+    last=start
+    while True:
+        rows=fetch(last,page_size)
+        yield from rows
+        if len(rows)<page_size:
+            return
+        last=rows[-1][0]
+
+# Streaming Export
+# One read cursor per export, drained with fetchmany, so only chunk_size rows
+# are in memory at a time however big the table is. Nothing goes through the
+# query cache.
+EXPORTS={"students":(SELECT_STUDENTS,STUDENT_FIELDS),
+         "teachers":(SELECT_TEACHERS,TEACHER_FIELDS),
+         "averages":(SELECT_STUDENT_AVERAGES+" order by s.id",STUDENT_FIELDS+("average",)),
+         "feedback":(SELECT_FEEDBACK,FEEDBACK_FIELDS),
+         "grades":("select student_id,subject,grade from grades order by student_id,subject",
+                   ("student_id","subject","grade"))}
+EXPORT_FORMATS={".csv":"csv",".jsonl":"jsonl",".cols":"columnar"}
+COLUMNAR_MAGIC=b"SCHOOLCOLS1\n"
+
+def iter_chunks(sql,params=(),chunk_size=5000):
+    """Yield lists of at most chunk_size rows from one cursor."""
+    cursor=get_connection().execute(sql,params)
+    try:
+        while True:
+            rows=cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows
+    finally:
+        cursor.close()
+
+def _write_csv(out,columns,chunks,result):
+    writer=csv.writer(out)
+    writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        result.rows+=len(rows)
+
+# json.dumps builds a new encoder per call when given separators; reuse one
+_compact_json=json.JSONEncoder(separators=(",",":")).encode
+
+def _write_jsonl(out,columns,chunks,result):
+    for rows in chunks:
+        out.write("".join(_compact_json(dict(zip(columns,r)))+"\n" for r in rows))
+        result.rows+=len(rows)
+
+def _write_columnar(out,columns,chunks,result):
+    # magic, a JSON header line, then one block per chunk: <row count> and, for
+    # each column, <length><zlib(JSON array of that column's values)>. Values of
+    # one column sit together, which is what makes them compress well.
+    out.write(COLUMNAR_MAGIC)
+    out.write(json.dumps({"columns":columns}).encode()+b"\n")
+    for rows in chunks:
+        out.write(struct.pack("<I",len(rows)))
+        for values in zip(*rows):
+            block=zlib.compress(_compact_json(values).encode(),6)
+            out.write(struct.pack("<I",len(block)))
+            out.write(block)
+        result.rows+=len(rows)
+
+def read_columnar(path):
+    """Yield (columns, rows) per block of a file written by the columnar exporter."""
+    with open(path,"rb") as f:
+        if f.readline()!=COLUMNAR_MAGIC:
+            raise ValueError(f"{path} is not a columnar export")
+        columns=json.loads(f.readline())["columns"]
+        while True:
+            head=f.read(4)
+            if not head:
+                return
+            (count,)=struct.unpack("<I",head)
+            values=[]
+            for _ in columns:
+                (length,)=struct.unpack("<I",f.read(4))
+                values.append(json.loads(zlib.decompress(f.read(length))))
+            yield columns,list(zip(*values)) if count else []
+
+_WRITERS={"csv":(_write_csv,False),"jsonl":(_write_jsonl,False),"columnar":(_write_columnar,True)}
+
+class ExportResult:
+    def __init__(self,kind,fmt):
+        self.kind=kind
+        self.format=fmt
+        self.rows=0
+        self.bytes=None  # unknown when writing to stdout
+        self.seconds=0.0
+
+    def rows_per_sec(self):
+        return self.rows/self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        size=f" ({self.bytes} bytes)" if self.bytes is not None else ""
+        return (f"{self.kind}: {self.rows} rows exported as {self.format}{size} "
+                f"in {self.seconds:.2f}s ({self.rows_per_sec():.0f} rows/sec)")
+
+def export_format(path):
+    """Format implied by a file extension, or None."""
+    for ext,fmt in EXPORT_FORMATS.items():
+        if path and path.lower().endswith(ext):
+            return fmt
+    return None
+
+@metrics.instrument("db.export_table",rows=lambda result:result.rows)
+def export_table(kind,path=None,fmt=None,chunk_size=5000):
+    """Stream table `kind` to path (stdout when None) as csv, jsonl or columnar."""
+    if kind not in EXPORTS:
+        raise ValueError(f"unknown export kind {kind!r}")
+    fmt=fmt or export_format(path) or "csv"
+    if fmt not in _WRITERS:
+        raise ValueError(f"unknown export format {fmt!r}")
+    write,binary=_WRITERS[fmt]
+    sql,columns=EXPORTS[kind]
+    result=ExportResult(kind,fmt)
+    start=time.perf_counter()
+    if path is None:
+        out=sys.stdout.buffer if binary else sys.stdout
+    else:
+        out=open(path,"wb") if binary else open(path,"w",newline="",encoding="utf-8")
+    chunks=iter_chunks(sql,chunk_size=chunk_size)
+    try:
+        write(out,columns,chunks,result)
+        out.flush()
+        if path is not None:
+            result.bytes=out.tell()
+    finally:
+        chunks.close()
+        if path is not None:
+            out.close()
+    result.seconds=time.perf_counter()-start
+    return result
+
+# Payroll
+# Tax is computed inside SQLite over the whole teachers table in one grouped
+# query; brackets are (lower bound, rate) pairs ascending from 0. The default
+# table taxes the whole salary at its band's rate; progressive=True taxes each
+# slice of the salary at its own band's rate.
+PAYROLL_BRACKETS=((0,0.10),(5000,0.15))
+
+def check_brackets(brackets):
+    """Validate (lower bound, rate) pairs; returns (bounds, rates) as float lists. Shared with PayrollEngine."""
+    pairs=[(float(b),float(r)) for b,r in brackets]
+    bounds=[b for b,_ in pairs]
+    rates=[r for _,r in pairs]
+    if not bounds or bounds[0]!=0:
+        raise ValueError("the first bracket must start at 0")
+    if any(lo>=hi for lo,hi in zip(bounds,bounds[1:])):
+        raise ValueError("bracket lower bounds must be strictly ascending")
+    if any(not 0<=r<=1 for r in rates):
+        raise ValueError("bracket rates must be between 0 and 1")
+    return bounds,rates
+
+def band_labels(brackets=PAYROLL_BRACKETS):
+    bounds,_=check_brackets(brackets)
+    return [f"{lo:g}-{hi:g}" for lo,hi in zip(bounds,bounds[1:])]+[f"{bounds[-1]:g}+"]
+
+def payroll_sql(brackets=PAYROLL_BRACKETS,progressive=False):
+    # bounds and rates are floats by now, so inlining their repr is safe
+    bounds,rates=check_brackets(brackets)
+    if len(bounds)==1:
+        # a case with no when clauses is not valid SQL
+        band,flat_rate="0",repr(rates[0])
+    else:
+        band="case "+" ".join(f"when salary>={bounds[i]!r} then {i}" for i in range(len(bounds)-1,0,-1))+" else 0 end"
+        flat_rate="case "+" ".join(f"when salary>={bounds[i]!r} then {rates[i]!r}"
+                                   for i in range(len(bounds)-1,0,-1))+f" else {rates[0]!r} end"
+    if progressive:
+        uppers=bounds[1:]+[None]
+        tax="+".join(f"max({'salary' if hi is None else f'min(salary,{hi!r})'}-{lo!r},0)*{r!r}"
+                     for lo,hi,r in zip(bounds,uppers,rates))
+    else:
+        tax=f"salary*{flat_rate}"
+    return f"""select subject,band,count(*),total(salary),total(tax)
+               from (select subject,salary,{band} as band,{tax} as tax from teachers)
+               group by subject,band"""
+
+def _payroll_row():
+    return {"teachers":0,"gross":0.0,"tax":0.0,"net":0.0}
+
+@metrics.instrument("db.payroll",rows=lambda payroll:payroll["teachers"])
+def payroll(brackets=PAYROLL_BRACKETS,progressive=False):
+    """Gross, tax and net pay in total, per subject and per tax band."""
+    # normalised before it becomes part of the cache key: a list of lists is
+    # unhashable, and equal tables spelled differently share one entry
+    bounds,rates=check_brackets(brackets)
+    return _payroll(tuple(zip(bounds,rates)),bool(progressive))
+
+@cached_query
+def _payroll(brackets,progressive):
+    labels=band_labels(brackets)
+    result=_payroll_row()
+    by_subject={}
+    by_band={label:_payroll_row() for label in labels}
+    for subject,band,count,gross,tax in get_connection().execute(payroll_sql(brackets,progressive)):
+        for row in (result,by_subject.setdefault(subject,_payroll_row()),by_band[labels[band]]):
+            row["teachers"]+=count
+            row["gross"]+=gross
+            row["tax"]+=tax
+            row["net"]+=gross-tax
+    result["by_subject"]=dict(sorted(by_subject.items()))
+    result["by_band"]=by_band
+    return result
+
+def parse_brackets(text):
+    """'0:0.1,5000:0.15' -> ((0.0,0.1),(5000.0,0.15))"""
+    try:
+        brackets=tuple((float(lo),float(rate)) for lo,rate in (part.split(":") for part in text.split(",")))
+    except ValueError:
+        raise ValueError(f"brackets must look like 0:0.1,5000:0.15, got {text!r}")
+    check_brackets(brackets)
+    return brackets
+
+#  Classes
+class Student:
+    def __init__(self,id,name,age,phone,grade,student_class):
+        self.id=id
+        self.name=name
+        self.age=age
+        self.phone=phone
+        self.grade=grade
+        self.student_class=student_class
+        self.grades={}
+
+    def add_grade(self,subject,grade):
+        if 0<=grade<=100:
+            self.grades[subject]=grade
+
+    def average(self):
+        return sum(self.grades.values())/len(self.grades) if self.grades else 0
+
+class Teacher:
+    def __init__(self,id,name,age,phone,subject,salary):
+        self.id=id
+        self.name=name
+        self.age=age
+        self.phone=phone
+        self.subject=subject
+        self.salary=salary
+        self.classes=[]
@@ -0,0 +1,43 @@
+"""Shared fixtures: a fresh SQLite database per test and the project scripts as modules."""
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import school_db  # noqa: E402
+
+
+def load_script(name, filename):
+    """Import one of the project scripts (their file names contain spaces)."""
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="session")
+def project():
+    return load_script("school_project", "school project.py")
+
+
+@pytest.fixture(scope="session")
+def system():
+    return load_script("school_system", "school system.py")
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = str(tmp_path / "school.db")
+    school_db.configure_db(path)
+    school_db.init_db()
+    yield path
+    school_db.close_db()
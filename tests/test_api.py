@@ -0,0 +1,35 @@
+import http.client
+import json
+import threading
+import time
+
+import school_api
+
+
+def test_idle_keep_alive_connections_do_not_starve_the_pool(db):
+    server = school_api.make_server(db, port=0, workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    port = server.server_address[1]
+    idle = []
+    try:
+        # two keep-alive clients take both threads, then go quiet
+        for _ in range(2):
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+            conn.request("GET", "/students")
+            assert conn.getresponse().read()
+            idle.append(conn)
+
+        started = time.monotonic()
+        third = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        third.request("GET", "/students?limit=5")
+        response = third.getresponse()
+        assert response.status == 200
+        assert json.loads(response.read()) == {"items": [], "next": None}
+        assert time.monotonic() - started < 2
+        third.close()
+    finally:
+        for conn in idle:
+            conn.close()
+        server.shutdown()
+        server.server_close()
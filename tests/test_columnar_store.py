@@ -0,0 +1,55 @@
+import pytest
+
+
+def test_views_behave_like_students_inside_a_school(system):
+    store = system.StudentStore()
+    school = system.School("Test")
+    for i in range(10):
+        view = store.add(f"S{i}", f"Student {i}", 15, "0123456789", 10, "10-A")
+        assert school.add_student(view)
+        view.add_grade("Math", 50 + i)
+
+    view = school.get_student("S9")
+    view.add_grade("Art", 100)
+    assert view.get_grades() == {"Math": 59, "Art": 100}
+    assert view.calculate_average() == 79.5
+    assert school.get_top_students(1)[0][0].get_id() == "S9"
+
+    view.set_name("Zed")
+    assert [s.get_id() for s in school.search_students_by_name("ze")] == ["S9"]
+    # rows registered with the same managers share listener tuples: a handful
+    # for the whole store rather than two per row
+    assert len(store._listener_sets) <= 4
+
+
+def test_grades_and_classes_are_created_on_first_use(system):
+    student = system.Student("S1", "Ann", 15, "0123456789", 10, "10-A")
+    assert student.get_grades() == {}
+    assert student.calculate_average() == 0
+    student.add_grade("Math", 90)
+    assert student.get_grades() == {"Math": 90}
+
+    teachers = system.TeacherStore()
+    teacher = teachers.add("T1", "Bob", 40, "0123456789", "Math", 4000)
+    assert teacher.get_classes() == []
+    assert teacher.add_class("10-A") and not teacher.add_class("10-A")
+    assert teachers.get("T1").get_classes() == ["10-A"]
+
+
+def test_packed_columns_survive_growth_and_edits(system):
+    store = system.StudentStore()
+    for i in range(5000):
+        store.add(f"S{i}", f"Student {i}", 15, f"01{i:08}", 10, "10-A")
+    assert len(store) == 5000
+    assert store.get("S4321").get_phone() == "0100004321"
+    assert store.get("missing") is None
+
+    view = store.get("S7")
+    view.set_name("Zoë Longer-Name Than Before")
+    view.set_phone("0999")
+    assert store.get("S7").get_name() == "Zoë Longer-Name Than Before"
+    assert store.get("S7").get_phone() == "0999"
+    assert store.get("S8").get_name() == "Student 8"
+
+    with pytest.raises(ValueError):
+        store.add("S7", "Again", 15, "0123456789", 10, "10-A")
@@ -0,0 +1,71 @@
+import queue
+
+from school_db import get_connection
+
+FEEDBACK_SQL = "insert into feedback (person_id,role,comment) values (?,?,?)"
+GRADE_SQL = "insert into grades (student_id,subject,grade) values (?,?,?)"
+
+
+class FakeRoot:
+    """Stands in for the Tk root; the worker only needs after/after_cancel."""
+
+    def after(self, ms, fn):
+        return "poll"
+
+    def after_cancel(self, ident):
+        pass
+
+
+def drain(results):
+    outcomes = []
+    while True:
+        try:
+            outcomes.append(results.get_nowait())
+        except queue.Empty:
+            return outcomes
+
+
+def test_batch_is_one_transaction(project, db):
+    worker = project.DBWorker(FakeRoot())
+    try:
+        conn = get_connection()
+        statements = []
+        conn.set_trace_callback(lambda sql: statements.append((sql, conn.in_transaction)))
+        batch = [project.DBJob(sql=FEEDBACK_SQL, params=("S1", "student", "first")),
+                 project.DBJob(sql=GRADE_SQL, params=("S1", "Math", 150)),
+                 project.DBJob(sql=FEEDBACK_SQL, params=("S2", "student", "second"))]
+        worker._write_batch(batch)
+        conn.set_trace_callback(None)
+    finally:
+        worker.stop()
+
+    assert statements[0] == ("begin", False)
+    # every statement after the begin, the final commit included, runs inside
+    # the same transaction: no savepoint release committed on its own
+    assert all(in_transaction for _, in_transaction in statements[1:])
+    assert [sql for sql, _ in statements].count("COMMIT") == 1
+    outcomes = drain(worker._results)
+    assert [error is None for _, _, error in outcomes] == [True, False, True]
+    assert conn.execute("select count(*) from feedback").fetchone()[0] == 2
+    assert conn.execute("select count(*) from grades").fetchone()[0] == 0
+
+
+def test_on_busy_fires_only_on_changes(project, db):
+    calls = []
+    worker = project.DBWorker(FakeRoot(), on_busy=calls.append)
+    try:
+        for _ in range(3):
+            worker._poll()
+        assert calls == []
+        done = queue.Queue()
+        worker.submit(lambda: 1, on_done=done.put)
+        worker.submit(lambda: 2, on_done=done.put)
+        assert calls == [True]
+        while worker.pending:
+            worker._poll()
+        for _ in range(3):
+            worker._poll()
+        assert calls == [True, False]
+        assert sorted([done.get_nowait(), done.get_nowait()]) == [1, 2]
+    finally:
+        worker.stop()
@@ -0,0 +1,48 @@
+import school_db
+
+
+def comments(rows):
+    return sorted(row[3] for row in rows)
+
+
+def add_comments():
+    school_db.add_feedback("S1", "student", "Great progress in mathematics")
+    school_db.add_feedback("S2", "student", "Needs help with reading")
+    school_db.add_feedback("T1", "teacher", "Mathematical puzzles every Friday")
+
+
+def test_prefix_search_matches_every_word(db):
+    add_comments()
+    assert comments(school_db.search_feedback("math")) == ["Great progress in mathematics",
+                                                           "Mathematical puzzles every Friday"]
+    assert comments(school_db.search_feedback("great math")) == ["Great progress in mathematics"]
+    assert comments(school_db.search_feedback("read")) == ["Needs help with reading"]
+    assert school_db.search_feedback("history") == []
+    # FTS syntax in user input is matched as plain words, not parsed
+    assert school_db.search_feedback('math" OR "read') == []
+    assert school_db.search_feedback("  ") == []
+
+
+def test_index_follows_updates_and_deletes(db):
+    add_comments()
+    assert len(school_db.search_feedback("math")) == 2
+    with school_db.write_transaction() as conn:
+        conn.execute("update feedback set comment='Strong essays in history' where person_id='S1'")
+        conn.execute("delete from feedback where person_id='T1'")
+    assert school_db.search_feedback("math") == []
+    assert comments(school_db.search_feedback("essay")) == ["Strong essays in history"]
+    school_db.add_feedback("S3", "student", "History project on time")
+    assert comments(school_db.search_feedback("hist")) == ["History project on time", "Strong essays in history"]
+
+
+def test_like_fallback_without_fts5(db):
+    with school_db.write_transaction() as conn:
+        # what a SQLite build without FTS5 leaves behind: no index, no triggers
+        for trigger in ("feedback_fts_ai", "feedback_fts_ad", "feedback_fts_au"):
+            conn.execute(f"drop trigger {trigger}")
+        conn.execute("drop table feedback_fts")
+    add_comments()
+    assert comments(school_db.search_feedback("math")) == ["Great progress in mathematics",
+                                                           "Mathematical puzzles every Friday"]
+    assert comments(school_db.search_feedback("great math")) == ["Great progress in mathematics"]
+    assert school_db.search_feedback("history") == []
@@ -0,0 +1,20 @@
+import pytest
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def calculator(request, system, monkeypatch):
+    if request.param == "pure":
+        monkeypatch.setattr(system, "np", None)
+    elif system.np is None:
+        pytest.skip("numpy not installed")
+    return system.AdvancedGradeCalculator()
+
+
+def test_batch_methods_accept_generators(calculator):
+    averages = [95, 85.5, 72, 61, 40]
+    assert calculator.calculate_letter_grades(a for a in averages) == ["A", "B", "C", "D", "F"]
+    assert calculator.get_grade_statuses(iter(averages)) == [calculator.get_grade_status(a) for a in averages]
+    grade_lists = [[95, 85], [], [72, 61, 40]]
+    expected = [calculator.calculate_gpa(dict(enumerate(grades))) for grades in grade_lists]
+    assert calculator.calculate_gpas(iter(grade for grade in grades) for grades in grade_lists) == expected
+    assert calculator.calculate_gpas(grade_lists) == expected
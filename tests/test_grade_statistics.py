@@ -0,0 +1,40 @@
+import math
+import random
+import statistics
+
+import pytest
+
+
+def check(distribution, grades):
+    ordered = sorted(grades)
+    assert distribution.count == len(grades)
+    assert distribution.mean == pytest.approx(statistics.fmean(grades))
+    assert distribution.variance() == pytest.approx(statistics.pvariance(grades))
+    for q in (0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0):
+        assert distribution.quantile(q) == ordered[max(1, math.ceil(q * len(grades))) - 1]
+    expected = dict.fromkeys(range(0, 100, 10), 0)
+    for grade in grades:
+        expected[min(int(grade // 10) * 10, 90)] += 1
+    assert distribution.histogram() == expected
+
+
+@pytest.mark.parametrize("step", [1, 0.5])
+def test_statistics_follow_overwritten_grades(system, step):
+    # grades on the sketch's own grid, so quantiles must be exact
+    rng = random.Random(11)
+    grade_stats = system.GradeStatistics(step)
+    students = [system.Student(f"S{i:03}", f"Student {i}", 15, "0123456789", 10, f"10-{'AB'[i % 2]}")
+                for i in range(200)]
+    for student in students[:100]:
+        student.add_grade("Math", rng.randint(0, 100))
+        grade_stats.add_student(student)
+    for student in students[100:]:
+        grade_stats.add_student(student)
+    for _ in range(2000):
+        student = rng.choice(students)
+        student.add_grade(rng.choice(("Math", "Art")), rng.randrange(int(100 / step) + 1) * step)
+
+    grades = [(s.get_class(), subject, grade) for s in students for subject, grade in s.get_grades().items()]
+    check(grade_stats.overall, [grade for _, _, grade in grades])
+    check(grade_stats.for_class("10-A"), [grade for c, _, grade in grades if c == "10-A"])
+    check(grade_stats.for_subject("Art"), [grade for _, subject, grade in grades if subject == "Art"])
@@ -0,0 +1,54 @@
+import asyncio
+import random
+
+
+class FakeNotificationSink:
+    """Local stand-in for an SMTP/SMS gateway with injected latency and failures"""
+
+    def __init__(self, latency=0.01, failure_rate=0.0, seed=None, always_fail=()):
+        self._latency = latency
+        self._failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._always_fail = set(always_fail)
+        self.attempts = []
+        self.delivered = []
+
+    async def send_async(self, message):
+        self.attempts.append(message)
+        await asyncio.sleep(self._latency)
+        if message in self._always_fail or self._random.random() < self._failure_rate:
+            return False
+        self.delivered.append(message)
+        return True
+
+
+def test_dispatcher_counts_retries_and_flush_drains(system):
+    sink = FakeNotificationSink(latency=0.002, failure_rate=0.3, seed=3)
+    with system.AsyncNotificationDispatcher(sink, batch_size=8, max_concurrency=4,
+                                            max_retries=2, backoff=0.001) as dispatcher:
+        for i in range(200):
+            dispatcher.send_notification(f"message {i}")
+        dispatcher.flush(timeout=10)
+        assert dispatcher._queue.empty()
+        stats = dispatcher.get_stats()
+    assert stats["queued"] == 200
+    assert stats["sent"] == len(sink.delivered) == len(set(sink.delivered))
+    assert stats["sent"] + stats["failed"] == 200
+    assert stats["retries"] == len(sink.attempts) - 200
+    assert stats["retries"] > 0 and stats["failed"] > 0
+    assert len(sink.attempts) <= 200 * 3
+
+
+def test_later_batches_go_out_while_a_batch_retries(system):
+    sink = FakeNotificationSink(latency=0.001, always_fail={"bounce"})
+    with system.AsyncNotificationDispatcher(sink, batch_size=1, max_concurrency=4,
+                                            max_retries=2, backoff=0.1) as dispatcher:
+        dispatcher.send_notification("bounce")
+        for i in range(5):
+            dispatcher.send_notification(f"message {i}")
+        dispatcher.flush(timeout=10)
+        stats = dispatcher.get_stats()
+    assert stats["sent"] == 5 and stats["failed"] == 1 and stats["retries"] == 2
+    # the bounced message's final retry comes after every other delivery
+    assert sink.attempts[-1] == "bounce"
+    assert sink.attempts.count("bounce") == 3
@@ -0,0 +1,48 @@
+import pytest
+
+import school_db
+
+
+def test_payroll_accepts_list_brackets(db):
+    school_db.add_teacher_to_db(school_db.Teacher("T1", "Bob", 40, "0123456789", "Math", 4000))
+    school_db.add_teacher_to_db(school_db.Teacher("T2", "Eve", 45, "0123456789", "Art", 6000))
+
+    result = school_db.payroll([[0, 0.1], [5000, 0.2]])
+    assert result["tax"] == pytest.approx(400 + 1200)
+    assert list(result["by_band"]) == ["0-5000", "5000+"]
+    # the same table spelled as a tuple of ints hits the cached entry
+    hits = school_db.query_cache.hits
+    school_db.payroll(((0, 0.1), (5000, 0.2)))
+    assert school_db.query_cache.hits == hits + 1
+
+
+def test_engine_and_sql_share_validation_and_labels(system):
+    engine = system.PayrollEngine([(0, 0.1), (2500.5, 0.2)])
+    assert engine.band_labels() == school_db.band_labels([(0, 0.1), (2500.5, 0.2)]) == ["0-2500.5", "2500.5+"]
+    for bad in ([(100, 0.1)], [(0, 0.1), (0, 0.2)], [(0, 1.5)]):
+        with pytest.raises(ValueError) as engine_error:
+            system.PayrollEngine(bad)
+        with pytest.raises(ValueError) as sql_error:
+            school_db.payroll(bad)
+        assert str(engine_error.value) == str(sql_error.value)
+
+
+def test_single_band_payroll(db):
+    school_db.add_teacher_to_db(school_db.Teacher("T1", "Bob", 40, "0123456789", "Math", 4000))
+    school_db.add_teacher_to_db(school_db.Teacher("T2", "Eve", 45, "0123456789", "Art", 6000))
+    for progressive in (False, True):
+        result = school_db.payroll(school_db.parse_brackets("0:0.1"), progressive)
+        assert result["tax"] == pytest.approx(1000)
+        assert result["by_band"] == {"0+": {"teachers": 2, "gross": 10000, "tax": 1000, "net": 9000}}
+
+
+def test_calculate_taxes_returns_python_floats(system, monkeypatch):
+    engine = system.PayrollEngine(((0, 0.0), (3000, 0.1), (6000, 0.2)), progressive=True)
+    expected = [0.0, 200.0, 900.0]
+    taxes = engine.calculate_taxes([2000, 5000, 9000])
+    assert taxes == pytest.approx(expected)
+    assert all(type(tax) is float for tax in taxes)
+    monkeypatch.setattr(system, "np", None)
+    taxes = engine.calculate_taxes([2000, 5000, 9000])
+    assert taxes == pytest.approx(expected)
+    assert all(type(tax) is float for tax in taxes)
@@ -0,0 +1,34 @@
+import sqlite3
+import threading
+
+import school_db
+
+
+def run_in_thread(fn):
+    result = []
+    thread = threading.Thread(target=lambda: result.append(fn()))
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+def test_new_thread_sees_external_write(db):
+    school_db.add_feedback("S1", "student", "first")
+    assert len(school_db.load_feedback()) == 1
+
+    # another process writing the file: a separate connection this module never sees
+    other = sqlite3.connect(db)
+    with other:
+        other.execute(school_db.INSERT_FEEDBACK, ("S2", "student", "second"))
+    other.close()
+
+    # a thread whose first query comes after the external write has no earlier
+    # data_version to compare against, so it must not reuse the cached rows
+    assert len(run_in_thread(school_db.load_feedback)) == 2
+
+
+def test_cache_hits_without_writes(db):
+    school_db.load_feedback()
+    hits = school_db.query_cache.hits
+    school_db.load_feedback()
+    assert school_db.query_cache.hits == hits + 1
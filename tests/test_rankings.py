@@ -0,0 +1,40 @@
+import random
+from bisect import bisect_left
+
+
+def test_sorted_list_positions_match_a_plain_list(system):
+    rng = random.Random(7)
+    sorted_list = system._SortedList()
+    plain = []
+    for step in range(20000):
+        if plain and rng.random() < 0.3:
+            item = plain.pop(rng.randrange(len(plain)))
+            sorted_list.remove(item)
+        else:
+            item = (rng.random(), step)
+            sorted_list.add(item)
+            plain.append(item)
+        if step % 97 == 0:
+            plain.sort()
+            probe = (rng.random(), 0)
+            assert sorted_list.bisect_left(probe) == bisect_left(plain, probe)
+    plain.sort()
+    assert list(sorted_list) == plain
+    assert len(sorted_list) == len(plain)
+
+
+def test_rank_follows_grade_changes(system):
+    school = system.School("Test")
+    students = []
+    for i in range(3000):
+        student = system.Student(f"S{i:04}", f"Student {i}", 15, "0123456789", 10, "10-A")
+        student.add_grade("Math", i % 101)
+        school.add_student(student)
+        students.append(student)
+    students[5].add_grade("Math", 100)
+    students[5].add_grade("Art", 100)
+    assert school.get_student_rank("S0005")[0] == 1
+    averages = [s.calculate_average() for s in students]
+    for i in (0, 5, 1234, 2999):
+        better = sum(average > averages[i] for average in averages)
+        assert school.get_student_rank(f"S{i:04}")[:2] == (better + 1, 3000)
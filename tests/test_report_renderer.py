@@ -0,0 +1,17 @@
+import io
+
+
+def test_text_reports_match_display_info(system):
+    student = system.Student("S1", "Ann Lee", 15, "0123456789", 10, "10-A")
+    student.add_grade("Math", 91)
+    teacher = system.Teacher("T1", "Bob Ray", 40, "0123456789", "Math", 4000)
+    teacher.add_class("10-A")
+    banner = "=" * 50
+
+    sink = io.StringIO()
+    system.ReportRenderer("text").render_all([student], sink)
+    system.ReportRenderer("text").render(teacher, sink)
+
+    assert sink.getvalue() == (
+        f"{banner}\nSTUDENT REPORT\n{banner}\n{student.display_info()}\n{banner}\n\n"
+        f"{banner}\nTEACHER REPORT\n{banner}\n{teacher.display_info()}\n{banner}\n\n")
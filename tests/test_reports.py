@@ -0,0 +1,22 @@
+import multiprocessing
+
+import pytest
+
+
+@pytest.mark.parametrize("method", ["fork", "spawn", "forkserver"])
+def test_generate_all_reports_under_each_start_method(system, tmp_path, method):
+    if method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"{method} is not available here")
+    school = system.School("Test")
+    for i in range(25):
+        student = system.Student(f"S{i:02}", f"Student {i}", 15, "0123456789", 10, "10-A")
+        student.add_grade("Math", 60 + i)
+        school.add_student(student)
+
+    output = tmp_path / "reports.txt"
+    result = school.generate_all_reports(output_file=str(output), workers=2, chunk_size=10,
+                                         mp_context=multiprocessing.get_context(method))
+    assert result["reports"] == 25
+    text = output.read_text(encoding="utf-8")
+    assert text.count("STUDENT REPORT") == 25
+    assert "Student 24" in text
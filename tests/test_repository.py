@@ -0,0 +1,71 @@
+import argparse
+import sqlite3
+
+import pytest
+
+import school_db
+
+
+def make_student(system, student_id="S1", name="Ann Lee"):
+    return system.Student(student_id, name, 15, "0123456789", 10, "10-A")
+
+
+def test_repository_writes_feed_grade_totals(system, db):
+    repository = system.SchoolRepository(db)
+    school = system.School("Test", repository=repository)
+    student = make_student(system)
+    school.add_student(student)
+    student.add_grade("Math", 80)
+    student.add_grade("Science", 90)
+    school.close()
+
+    school_db.query_cache.clear()
+    assert school_db.load_student_averages_page(None, 10)[0][-1] == 85
+
+
+def test_grade_totals_backfilled_for_old_databases(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("create table grades (student_id text, subject text, grade real)")
+        conn.executemany("insert into grades values (?,?,?)", [("S1", "Math", 70), ("S1", "Art", 90)])
+    school_db.create_schema(conn)
+    assert conn.execute("select total, count from grade_totals").fetchall() == [(160, 2)]
+    conn.close()
+
+
+def test_flush_reports_ids_taken_by_another_process(system, db):
+    repository = system.SchoolRepository(db)
+    school = system.School("Test", repository=repository)
+    school.add_student(make_student(system, name="Mine"))
+
+    other = sqlite3.connect(db)
+    with other:
+        other.execute(school_db.INSERT_STUDENT, ("S1", "Theirs", 16, "0123456789", 11, "11-B"))
+    other.close()
+
+    with pytest.raises(system.RepositoryConflictError) as error:
+        school.save()
+    assert error.value.conflicts == [("student", "S1")]
+    assert repository.pending_count() == 1
+    assert school_db.find_student("S1")[1] == "Theirs"
+    # ids already in the database are refused up front
+    assert not school.add_student(make_student(system, "S1"))
+    repository.discard()
+    school.close()
+
+
+def test_grades_for_unknown_students_are_rejected(project, db):
+    with pytest.raises(ValueError, match="no student 'S9'"):
+        school_db.add_grade_to_db("S9", "Math", 80)
+    # the GUI's queued write and the CLI hit the same check
+    with pytest.raises(sqlite3.IntegrityError, match="no such student"):
+        with school_db.write_transaction() as conn:
+            conn.execute(school_db.UPSERT_GRADE, ("S9", "Math", 80))
+    args = argparse.Namespace(kind="grade", student_id="S9", subject="Math", grade=80.0)
+    assert project.cmd_add(args) == 1
+
+    school_db.add_student_to_db(school_db.Student("S1", "Ann Lee", 15, "0123456789", 10, "10-A"))
+    assert school_db.add_grade_to_db("S1", "Math", 80)
+    conn = school_db.get_connection()
+    assert conn.execute("select student_id, total, count from grade_totals").fetchall() == [("S1", 80, 1)]
@@ -0,0 +1,40 @@
+def build_school(system):
+    school = system.School("Snapshot High")
+    for i in range(50):
+        student = system.Student(f"S{i:03}", f"Student {i}", 15, "0123456789", 10, f"10-{'AB'[i % 2]}")
+        if i % 5:
+            student.add_grade("Math", 70 + i % 30)
+            student.add_grade("Art", 80.5 + i / 10)
+        school.add_student(student)
+    teacher = system.Teacher("T1", "Bob Ray", 40, "0111111111", "Math", 4000.0)
+    teacher.add_class("10-A")
+    school.add_teacher(teacher)
+    return school
+
+
+def test_snapshot_round_trip(system, tmp_path):
+    path = str(tmp_path / "school.snap")
+    school = build_school(system)
+    assert school.save_snapshot(path) > 0
+
+    loaded = system.School.load_snapshot(path)
+    # lookups before the full load are lazy and miss cleanly
+    assert loaded.get_student("S999") is None
+    student = loaded.get_student("S007")
+    assert student.get_grades() == {"Math": 77, "Art": 81.2}
+    assert loaded._snapshot is not None
+
+    originals = {s.get_id(): s for s in school.get_all_students()}
+    restored = {s.get_id(): s for s in loaded.get_all_students()}
+    assert restored.keys() == originals.keys()
+    assert restored["S007"] is student
+    for student_id, original in originals.items():
+        copy = restored[student_id]
+        assert copy.display_info() == original.display_info()
+        assert copy.get_grades() == original.get_grades()
+        # ints stay ints and floats stay floats
+        assert [type(g) for g in copy.get_grades().values()] == [type(g) for g in original.get_grades().values()]
+    assert loaded.get_student("S000").get_grades() == {}
+    teacher = loaded.get_all_teachers()[0]
+    assert (teacher.get_id(), teacher.get_salary(), teacher.get_classes()) == ("T1", 4000.0, ["10-A"])
+    assert loaded.get_statistics() == school.get_statistics()
@@ -0,0 +1,18 @@
+import copy
+import pickle
+
+
+def test_ungraded_student_pickles_and_deep_copies(system):
+    student = system.Student("S1", "Ann Lee", 15, "0123456789", 10, "10-A")
+    for clone in (pickle.loads(pickle.dumps(student)), copy.deepcopy(student)):
+        assert clone.get_grades() == {}
+        assert list(clone.get_grade_values()) == []
+        assert clone.calculate_average() == 0
+        assert clone.add_grade("Math", 90)
+        assert clone.get_grades() == {"Math": 90}
+    # the clones got their own dicts; the original is still ungraded
+    assert student.get_grades() == {}
+
+    student.add_grade("Art", 70)
+    clone = pickle.loads(pickle.dumps(student))
+    assert clone.get_grades() == {"Art": 70} and clone.calculate_average() == 70
@@ -0,0 +1,12 @@
+def test_name_prefix_search_is_sorted_and_follows_renames(system):
+    manager = system.StudentManager()
+    names = ["carl", "Anna", "bob", "Ann", "anders"] + [f"x{i:04}" for i in range(3000)]
+    for i, name in enumerate(names):
+        manager.add_student(system.Student(f"S{i}", name, 15, "0123456789", 10, "10-A"))
+
+    assert [s.get_name() for s in manager.search_by_name_prefix("an")] == ["anders", "Ann", "Anna"]
+    assert len(manager.search_by_name_prefix("x1")) == 1000
+
+    manager.get_student("S2").set_name("Andy")
+    assert [s.get_name() for s in manager.search_by_name_prefix("an")] == ["anders", "Andy", "Ann", "Anna"]
+    assert manager.search_by_name_prefix("b") == []